@@ -856,6 +856,29 @@ def get_transcriptions():
     return jsonify({'transcriptions': recording_state['transcriptions']})
 
 # Monkey patch to capture transcriptions
+# Transcript file per recording_id, resolved from the database once per recording
+transcript_paths = {}
+
+def get_transcript_path(recording_id):
+    """Path of the live transcript file for a recording, or None if it is not in the database"""
+    transcript_path = transcript_paths.get(recording_id)
+    if transcript_path is None:
+        with app.app_context():  # Ensure Flask application context
+            rec = Recording.query.get(recording_id)
+            if not rec:
+                return None
+            # Create transcript file path using base directory (PyInstaller-aware)
+            recordings_dir = BASE_DIR / 'recordings'
+            
+            # Create a transcript filename based on recording title/timestamp
+            safe_title = "".join(c for c in rec.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+            transcript_path = recordings_dir / f"{safe_title}_transcript.txt"
+        
+        # Ensure recordings directory exists
+        recordings_dir.mkdir(parents=True, exist_ok=True)
+        transcript_paths[recording_id] = transcript_path
+    return transcript_path
+
 original_send = DualModeStreamer.send_text_to_server
 def patched_send(self, text):
     transcription_entry = {
@@ -865,33 +888,16 @@ def patched_send(self, text):
     }
     recording_state['transcriptions'].append(transcription_entry)
     
-    # Save to transcript file asynchronously (non-blocking)
-    if 'recording_id' in recording_state:
-        def save_transcript():
-            try:
-                with app.app_context():  # Ensure Flask application context
-                    rec = Recording.query.get(recording_state['recording_id'])
-                    if rec:
-                        # Create transcript file path using base directory (PyInstaller-aware)
-                        recordings_dir = BASE_DIR / 'recordings'
-                        
-                        # Create a transcript filename based on recording title/timestamp
-                        safe_title = "".join(c for c in rec.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                        transcript_filename = f"{safe_title}_transcript.txt"
-                        transcript_path = recordings_dir / transcript_filename
-                        
-                        # Ensure recordings directory exists
-                        recordings_dir.mkdir(parents=True, exist_ok=True)
-                        
-                        # Append transcript line to file
-                        with open(transcript_path, 'a', encoding='utf-8') as f:
-                            f.write(f"[{transcription_entry['timestamp']}] {text}\n")
-                        
-            except Exception as e:
-                logger.error(f" Transcript save error: {e}")
-        
-        # Run in background thread (no latency impact)
-        threading.Thread(target=save_transcript, daemon=True).start()
+    # Append to the transcript file. This already runs on the streamer's sender
+    # thread, off the Whisper loop, and a single writer keeps lines in order
+    if recording_state.get('recording_id'):
+        try:
+            transcript_path = get_transcript_path(recording_state['recording_id'])
+            if transcript_path:
+                with open(transcript_path, 'a', encoding='utf-8') as f:
+                    f.write(f"[{transcription_entry['timestamp']}] {text}\n")
+        except Exception as e:
+            logger.error(f" Transcript save error: {e}")
     
     return original_send(self, text)
 DualModeStreamer.send_text_to_server = patched_send
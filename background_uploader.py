@@ -13,10 +13,28 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 import requests
+from requests.adapters import HTTPAdapter
 from logging_config import app_logger as logger
 
+# Shared keep-alive session: webhooks after each upload reuse the TCP/TLS
+# connection instead of handshaking with ops.fyelabs.com every time
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+HTTP_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# upload_file streams the recording from disk part by part; 20 MB parts keep a
+# long meeting to a few hundred parts instead of boto3's default 8 MB. Four
+# parts in flight fill high-latency links a single stream cannot
+MB = 1024 * 1024
+S3_TRANSFER_CONFIG = TransferConfig(multipart_threshold=20 * MB, multipart_chunksize=20 * MB,
+                                    max_concurrency=4, use_threads=True)
+# Failed part requests are retried individually with exponential backoff
+S3_CLIENT_CONFIG = Config(retries={'max_attempts': 5, 'mode': 'standard'}, max_pool_connections=4)
+
 class BackgroundUploader:
     """Handles asynchronous uploading of recordings to IDrive E2"""
     
@@ -65,7 +83,8 @@ class BackgroundUploader:
                     endpoint_url=self.endpoint_url,
                     region_name=self.region,
                     aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
+                    aws_secret_access_key=secret_key,
+                    config=S3_CLIENT_CONFIG
                 )
                 # Test connection
                 self.s3_client.head_bucket(Bucket=self.bucket_name)
@@ -267,12 +286,15 @@ class BackgroundUploader:
                     self.active_uploads[recording_id] = {'files': {}, 'total_progress': 0}
                 self.active_uploads[recording_id]['files'][s3_key] = {'status': 'uploading', 'progress': 0}
             
-            # Upload with progress callback
+            # Upload with progress callback; boto3 reports per-chunk byte counts
+            # from each part thread, so they are summed under the lock
+            file_size = max(os.path.getsize(file_path), 1)
+            transferred = [0]
             def upload_progress(bytes_transferred):
-                file_size = os.path.getsize(file_path)
-                progress = int((bytes_transferred / file_size) * 100)
                 with self.upload_lock:
+                    transferred[0] += bytes_transferred
                     if recording_id in self.active_uploads:
+                        progress = min(int((transferred[0] / file_size) * 100), 100)
                         self.active_uploads[recording_id]['files'][s3_key]['progress'] = progress
             
             # Perform upload
@@ -281,7 +303,8 @@ class BackgroundUploader:
                 file_path, 
                 self.bucket_name, 
                 s3_key,
-                Callback=upload_progress
+                Callback=upload_progress,
+                Config=S3_TRANSFER_CONFIG
             )
             
             # Generate public URL
@@ -656,7 +679,7 @@ class BackgroundUploader:
             logger.info("=" * 80)
             logger.info(" SENDING WEBHOOK REQUEST...")
             
-            response = requests.post(
+            response = HTTP_SESSION.post(
                 self.webhook_url,
                 json=metadata,
                 headers={
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Hidden-window process helpers shared by the diagnostics scripts
+Probes spawn powershell / nvidia-smi repeatedly; on Windows each would otherwise
+flash a console window and start its own conhost.
+"""
+
+import os
+import subprocess
+
+def hidden_window_kwargs():
+    """Popen kwargs that suppress the console window (and its conhost startup) on Windows"""
+    if os.name != 'nt':
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {'startupinfo': startupinfo, 'creationflags': subprocess.CREATE_NO_WINDOW}
+
+def run_hidden(argv, **kwargs):
+    """subprocess.run without a console window on Windows"""
+    for key, value in hidden_window_kwargs().items():
+        kwargs.setdefault(key, value)
+    return subprocess.run(argv, shell=False, **kwargs)
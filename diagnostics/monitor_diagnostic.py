@@ -4,20 +4,180 @@ Windows Monitor Position Diagnostic
 Deep dive into Windows monitor positioning and FFmpeg behavior
 """
 
+import base64
+import queue
 import subprocess
 import json
 import sys
+import threading
+import time
 from pathlib import Path
 
 # Add current directory to path
 sys.path.append(str(Path(__file__).parent))
 
 from logging_config import get_logger
+from hidden_process import hidden_window_kwargs, run_hidden
 
 logger = get_logger("monitor_diagnostic")
 
+POWERSHELL_ARGS = ('powershell', '-NoProfile', '-NonInteractive', '-Command')
+
+class PowerShellSession:
+    """One long-lived PowerShell process that runs scripts sent over stdin
+    
+    Every powershell.exe start costs a few hundred milliseconds even with
+    -NoProfile, so the probes below share a single process. Each script is
+    written to stdin followed by a sentinel line; the server loop evaluates the
+    accumulated text and answers with its output and the same sentinel. A script
+    that fails answers with an error marker line instead of its output. If the
+    session hangs, dies or cannot be written to, it is killed and the remaining
+    scripts run one powershell.exe each.
+    """
+    
+    SENTINEL = '---END---'
+    ERROR_MARKER = '---ERROR---'
+    # Per script; WMI queries on a cold service can take several seconds
+    TIMEOUT = 30
+    # Non-ASCII monitor names must survive OEM code pages. The server loop talks
+    # BOM-less UTF-8 over explicit stdin/stdout streams (a windowless process has
+    # no console whose code page could be set); one-shot runs set it best effort.
+    UTF8_OUTPUT = 'try { [Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false } catch {}\n'
+    SERVER_LOOP = '''
+$utf8 = New-Object System.Text.UTF8Encoding $false
+$stdin = New-Object System.IO.StreamReader([Console]::OpenStandardInput(), $utf8)
+$stdout = New-Object System.IO.StreamWriter([Console]::OpenStandardOutput(), $utf8)
+$buffer = New-Object System.Text.StringBuilder
+while ($null -ne ($line = $stdin.ReadLine())) {
+    if ($line -ne '---END---') {
+        [void]$buffer.AppendLine($line)
+        continue
+    }
+    try {
+        $output = (Invoke-Expression $buffer.ToString()) -join "`n"
+    } catch {
+        $output = '---ERROR--- ' + ($_.Exception.Message -replace "\r?\n", ' ')
+    }
+    [void]$buffer.Clear()
+    $stdout.WriteLine($output)
+    $stdout.WriteLine('---END---')
+    $stdout.Flush()
+}
+'''
+    
+    def __init__(self):
+        self.ps = None
+        self.lines = None
+        self.broken = False
+    
+    def _start(self):
+        """Launch the server loop; -EncodedCommand sidesteps argv quoting of the script"""
+        encoded = base64.b64encode(self.SERVER_LOOP.encode('utf-16-le')).decode('ascii')
+        self.ps = subprocess.Popen(
+            [*POWERSHELL_ARGS[:-1], '-EncodedCommand', encoded],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', errors='replace', **hidden_window_kwargs()
+        )
+        # stdout is read on a thread so run() can give up on a hung script
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self.ps.stdout, self.lines), daemon=True).start()
+    
+    @staticmethod
+    def _read_stdout(stdout, lines):
+        """Forward output lines to the queue; None marks EOF"""
+        try:
+            for line in stdout:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+    
+    def _run_once(self, script):
+        """Run a script in its own powershell.exe ('' on failure or timeout)"""
+        try:
+            result = run_hidden([*POWERSHELL_ARGS, self.UTF8_OUTPUT + script], capture_output=True,
+                                 text=True, encoding='utf-8', errors='replace', timeout=self.TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"PowerShell query failed: {e}")
+            return ''
+        return result.stdout.strip() if result.returncode == 0 else ''
+    
+    def _abandon(self, reason):
+        """Kill a session that stopped answering; later scripts run one process each"""
+        logger.warning(f"PowerShell session {reason}, spawning per query")
+        self.broken = True
+        if self.ps is not None:
+            try:
+                self.ps.kill()
+                self.ps.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self.ps = None
+    
+    def run(self, script):
+        """Run a script in the shared process and return its stripped output ('' on failure)"""
+        if self.broken:
+            return self._run_once(script)
+        if self.ps is None or self.ps.poll() is not None:
+            try:
+                self._start()
+            except OSError as e:
+                self._abandon(f"unavailable ({e})")
+                return self._run_once(script)
+        
+        try:
+            self.ps.stdin.write(f"{script}\n{self.SENTINEL}\n")
+            self.ps.stdin.flush()
+        except OSError as e:
+            # BrokenPipeError included: the process is gone
+            self._abandon(f"not accepting input ({e})")
+            return self._run_once(script)
+        
+        lines = []
+        deadline = time.monotonic() + self.TIMEOUT
+        while True:
+            try:
+                line = self.lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self._abandon(f"timed out after {self.TIMEOUT}s")
+                return self._run_once(script)
+            if line is None:
+                self._abandon("exited mid-script")
+                return self._run_once(script)
+            if line.rstrip('\r\n') == self.SENTINEL:
+                break
+            lines.append(line)
+        
+        output = ''.join(lines).strip()
+        if output.startswith(self.ERROR_MARKER):
+            logger.warning(f"PowerShell script failed: {output[len(self.ERROR_MARKER):].strip()}")
+            return ''
+        return output
+    
+    def close(self):
+        """Close stdin so the server loop exits, then reap the process"""
+        if self.ps is None:
+            return
+        try:
+            self.ps.stdin.close()
+            self.ps.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.ps.kill()
+        self.ps = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
 def get_detailed_monitor_info():
     """Get detailed monitor information using multiple methods"""
+    with PowerShellSession() as ps:
+        _report_monitor_info(ps)
+
+def _report_monitor_info(ps):
+    """Run each detection method through the shared PowerShell session"""
     
     print("🔍 WINDOWS MONITOR POSITION DIAGNOSTIC")
     print("=" * 60)
@@ -42,12 +202,10 @@ def get_detailed_monitor_info():
     '''
     
     try:
-        result = subprocess.run([
-            'powershell', '-Command', ps_command
-        ], capture_output=True, text=True, shell=False)
+        output = ps.run(ps_command)
         
-        if result.returncode == 0 and result.stdout.strip():
-            screen_data = json.loads(result.stdout.strip())
+        if output:
+            screen_data = json.loads(output)
             if isinstance(screen_data, dict):
                 screen_data = [screen_data]
             
@@ -66,7 +224,8 @@ def get_detailed_monitor_info():
     
     # Method 2: WMI Monitor Information
     wmi_command = '''
-    Get-WmiObject -Namespace root\\wmi -Class WmiMonitorID | ForEach-Object {
+    Get-CimInstance -Namespace root\\wmi -ClassName WmiMonitorID |
+    Select-Object InstanceName, ManufacturerName, UserFriendlyName, SerialNumberID | ForEach-Object {
         $mfgCode = ($_.ManufacturerName | Where-Object {$_ -ne 0} | ForEach-Object {[char]$_}) -join ''
         $modelName = ($_.UserFriendlyName | Where-Object {$_ -ne 0} | ForEach-Object {[char]$_}) -join ''
         $serialNumber = ($_.SerialNumberID | Where-Object {$_ -ne 0} | ForEach-Object {[char]$_}) -join ''
@@ -76,16 +235,14 @@ def get_detailed_monitor_info():
             ModelName = $modelName
             SerialNumber = $serialNumber
         }
-    } | ConvertTo-Json
+    } | ConvertTo-Json -Compress
     '''
     
     try:
-        result = subprocess.run([
-            'powershell', '-Command', wmi_command
-        ], capture_output=True, text=True, shell=False)
+        output = ps.run(wmi_command)
         
-        if result.returncode == 0 and result.stdout.strip():
-            wmi_data = json.loads(result.stdout.strip())
+        if output:
+            wmi_data = json.loads(output)
             if isinstance(wmi_data, dict):
                 wmi_data = [wmi_data]
             
@@ -160,12 +317,10 @@ def get_detailed_monitor_info():
     '''
     
     try:
-        result = subprocess.run([
-            'powershell', '-Command', display_config_command
-        ], capture_output=True, text=True, shell=False)
+        output = ps.run(display_config_command)
         
-        if result.returncode == 0 and result.stdout.strip():
-            display_data = json.loads(result.stdout.strip())
+        if output:
+            display_data = json.loads(output)
             if isinstance(display_data, dict):
                 display_data = [display_data]
             
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Profile system_diagnostics.py under Scalene
+Attributes CPU, system (subprocess wait), memory and GPU time per line so the
+PowerShell / nvidia-smi / NVML probes can be compared before optimizing further
+
+Usage: python diagnostics/profile_diagnostics.py [--html] [--outfile FILE]
+Requires: pip install scalene
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+TARGET = Path(__file__).parent / "system_diagnostics.py"
+
+def build_command(html: bool, outfile: str = None) -> list:
+    """Build the scalene command line for profiling the diagnostics module"""
+    cmd = [sys.executable, "-m", "scalene", "--cpu", "--memory", "--gpu",
+           "--profile-all", "--reduced-profile"]
+
+    # Only report lines from the diagnostics module itself
+    cmd += ["--profile-only", TARGET.name]
+
+    if html:
+        cmd.append("--html")
+    else:
+        cmd.append("--cli")
+    if outfile:
+        cmd += ["--outfile", outfile]
+
+    cmd.append(str(TARGET))
+    return cmd
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile system_diagnostics.py with Scalene")
+    parser.add_argument("--html", action="store_true", help="Write an HTML report instead of CLI output")
+    parser.add_argument("--outfile", help="Where to write the report")
+    args = parser.parse_args()
+
+    try:
+        import scalene  # noqa: F401
+    except ImportError:
+        print("❌ Scalene is not installed - run: pip install scalene")
+        return 1
+
+    if not shutil.which("nvidia-smi"):
+        print("⚠️ nvidia-smi not found - GPU columns will be empty")
+
+    cmd = build_command(args.html, args.outfile)
+    print(f"🔍 Profiling: {' '.join(cmd)}")
+    return subprocess.call(cmd, cwd=TARGET.parent)
+
+if __name__ == "__main__":
+    sys.exit(main())
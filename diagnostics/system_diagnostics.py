@@ -4,13 +4,83 @@ System Performance Diagnostics Module
 Provides CPU, GPU, Memory, and AI acceleration detection for optimal resource allocation
 """
 
+import io
+import sys
+import bisect
+import csv
+import importlib.util
 import subprocess
-import json
-import psutil
-import platform
-from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from functools import cached_property, lru_cache
+from queue import Empty
+from typing import List, Optional, Dict, Any, Tuple
+
+# Importable both as diagnostics.<module> and as a script run from diagnostics/
+try:
+    from .hidden_process import run_hidden
+except ImportError:
+    from hidden_process import run_hidden
+
+# orjson parses PowerShell's ConvertTo-Json output considerably faster
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Diagnostic probes must never hang the caller or flash a console window
+SUBPROCESS_TIMEOUT = 5  # seconds
+NVML_PROBE_TIMEOUT = 10  # seconds, includes spawn-interpreter startup on a cold disk
+
+# Recommendation tiers: (ascending lower bounds, message template per tier)
+_CPU_TIERS = (
+    (0, 4, 8),
+    ("⚠️ Limited CPU: {} cores - Keep processing minimal",
+     "⚠️ Moderate CPU: {} cores - Use 2-3 worker threads",
+     "✅ Strong CPU: {} cores - Use parallel processing"),
+)
+_GPU_TIERS = (  # VRAM in MB
+    (float('-inf'), 2000, 6000),
+    ("⚠️ Limited GPU: {} - Stick to CPU processing",
+     "✅ Good GPU: {} - Use GPU with smaller models",
+     "🚀 Excellent GPU: {} - Use GPU acceleration for Whisper"),
+)
+_RAM_TIERS = (  # GB
+    (float('-inf'), 8, 16),
+    ("⚠️ Limited RAM: {:.1f}GB - Use small models only",
+     "⚠️ Adequate RAM: {:.1f}GB - Use medium models",
+     "✅ Plenty of RAM: {:.1f}GB - Can use larger models"),
+)
+
+def _pick_tier(tiers, value, strict: bool = False) -> str:
+    """Return the template of the highest tier whose bound is <= value (< value if strict)"""
+    bounds, messages = tiers
+    search = bisect.bisect_left if strict else bisect.bisect_right
+    return messages[max(search(bounds, value) - 1, 0)]
+
+# psutil is by far the slowest import here; load it on first use so callers
+# that only need the dataclasses don't pay for it
+psutil = None
+
+def _psutil():
+    """Return the psutil module, importing it on first use"""
+    global psutil
+    if psutil is None:
+        import psutil as _module
+        psutil = _module
+    return psutil
+
+@lru_cache(maxsize=1)
+def _system_static() -> Dict[str, Any]:
+    """Host facts that cannot change while the process is running"""
+    import platform
+    return {
+        'system': platform.system(),
+        'version': platform.version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count_physical': _psutil().cpu_count(logical=False),
+        'cpu_count_logical': _psutil().cpu_count(logical=True),
+    }
 
 @dataclass
 class CPUInfo:
@@ -58,25 +128,67 @@ class SystemDiagnostics:
     ai_frameworks: Dict[str, bool]
     recommendations: List[str]
 
+@lru_cache(maxsize=1)
+def _ai_framework_support() -> Tuple[Tuple[str, bool], ...]:
+    """Check AI framework availability once; installed packages don't change at runtime"""
+    frameworks = {}
+    
+    # PyTorch CUDA
+    try:
+        import torch
+        frameworks['pytorch'] = True
+        frameworks['pytorch_cuda'] = torch.cuda.is_available()
+    except ImportError:
+        frameworks['pytorch'] = False
+        frameworks['pytorch_cuda'] = False
+    
+    # TensorFlow
+    try:
+        import tensorflow as tf
+        frameworks['tensorflow'] = True
+        frameworks['tensorflow_gpu'] = len(tf.config.list_physical_devices('GPU')) > 0
+    except ImportError:
+        frameworks['tensorflow'] = False
+        frameworks['tensorflow_gpu'] = False
+    
+    # OpenVINO
+    try:
+        import openvino
+        frameworks['openvino'] = True
+    except ImportError:
+        frameworks['openvino'] = False
+    
+    # Faster Whisper / CTranslate2
+    try:
+        import faster_whisper
+        frameworks['faster_whisper'] = True
+    except ImportError:
+        frameworks['faster_whisper'] = False
+    
+    # Cached as immutable items; callers get their own dict to mutate or serialise
+    return tuple(frameworks.items())
+
 class SystemProfiler:
     """Main system diagnostics class"""
     
-    def __init__(self):
-        self.cuda_available = self._check_cuda()
+    @cached_property
+    def cuda_available(self) -> bool:
+        """Whether nvidia-smi runs; probed on first access only"""
+        return self._check_cuda()
         
     def get_cpu_info(self) -> CPUInfo:
         """Get comprehensive CPU information"""
         try:
             # Basic CPU info
-            cpu_freq = psutil.cpu_freq()
-            cpu_count_physical = psutil.cpu_count(logical=False)
-            cpu_count_logical = psutil.cpu_count(logical=True)
+            freq_current, freq_max = self._get_cpu_frequency()
+            cpu_count_physical = _system_static()['cpu_count_physical']
+            cpu_count_logical = _system_static()['cpu_count_logical']
             
             # CPU brand and features via PowerShell
             cpu_details = self._get_cpu_details_powershell()
             
             # CPU usage
-            cpu_usage = psutil.cpu_percent(interval=1)
+            cpu_usage = _psutil().cpu_percent(interval=1)
             
             # Temperature (if available)
             temperature = self._get_cpu_temperature()
@@ -85,9 +197,9 @@ class SystemProfiler:
                 brand=cpu_details.get('name', 'Unknown'),
                 cores_physical=cpu_count_physical or 1,
                 cores_logical=cpu_count_logical or 1,
-                frequency_max=cpu_freq.max if cpu_freq else 0,
-                frequency_current=cpu_freq.current if cpu_freq else 0,
-                architecture=cpu_details.get('architecture', platform.machine()),
+                frequency_max=freq_max,
+                frequency_current=freq_current,
+                architecture=cpu_details.get('architecture', _system_static()['machine']),
                 features=cpu_details.get('features', []),
                 usage_percent=cpu_usage,
                 temperature=temperature
@@ -118,8 +230,8 @@ class SystemProfiler:
     def get_memory_info(self) -> MemoryInfo:
         """Get system memory information"""
         try:
-            mem = psutil.virtual_memory()
-            swap = psutil.swap_memory()
+            mem = _psutil().virtual_memory()
+            swap = _psutil().swap_memory()
             
             return MemoryInfo(
                 total_gb=mem.total / (1024**3),
@@ -136,41 +248,7 @@ class SystemProfiler:
     
     def get_ai_framework_support(self) -> Dict[str, bool]:
         """Check AI framework availability"""
-        frameworks = {}
-        
-        # PyTorch CUDA
-        try:
-            import torch
-            frameworks['pytorch'] = True
-            frameworks['pytorch_cuda'] = torch.cuda.is_available()
-        except ImportError:
-            frameworks['pytorch'] = False
-            frameworks['pytorch_cuda'] = False
-        
-        # TensorFlow
-        try:
-            import tensorflow as tf
-            frameworks['tensorflow'] = True
-            frameworks['tensorflow_gpu'] = len(tf.config.list_physical_devices('GPU')) > 0
-        except ImportError:
-            frameworks['tensorflow'] = False
-            frameworks['tensorflow_gpu'] = False
-        
-        # OpenVINO
-        try:
-            import openvino
-            frameworks['openvino'] = True
-        except ImportError:
-            frameworks['openvino'] = False
-        
-        # Faster Whisper / CTranslate2
-        try:
-            import faster_whisper
-            frameworks['faster_whisper'] = True
-        except ImportError:
-            frameworks['faster_whisper'] = False
-        
-        return frameworks
+        return dict(_ai_framework_support())
     
     def generate_recommendations(self, cpu: CPUInfo, gpus: List[GPUInfo], 
                                memory: MemoryInfo, ai_frameworks: Dict[str, bool]) -> List[str]:
@@ -178,33 +256,20 @@ class SystemProfiler:
         recommendations = []
         
         # CPU recommendations
-        if cpu.cores_logical >= 8:
-            recommendations.append(f"✅ Strong CPU: {cpu.cores_logical} cores - Use parallel processing")
-        elif cpu.cores_logical >= 4:
-            recommendations.append(f"⚠️ Moderate CPU: {cpu.cores_logical} cores - Use 2-3 worker threads")
-        else:
-            recommendations.append(f"⚠️ Limited CPU: {cpu.cores_logical} cores - Keep processing minimal")
+        recommendations.append(_pick_tier(_CPU_TIERS, cpu.cores_logical).format(cpu.cores_logical))
         
         # GPU recommendations
-        cuda_gpus = [gpu for gpu in gpus if gpu.cuda_capable]
-        if cuda_gpus:
-            best_gpu = max(cuda_gpus, key=lambda g: g.memory_total)
-            if best_gpu.memory_total > 6000:  # >6GB VRAM
-                recommendations.append(f"🚀 Excellent GPU: {best_gpu.name} - Use GPU acceleration for Whisper")
-            elif best_gpu.memory_total > 2000:  # >2GB VRAM
-                recommendations.append(f"✅ Good GPU: {best_gpu.name} - Use GPU with smaller models")
-            else:
-                recommendations.append(f"⚠️ Limited GPU: {best_gpu.name} - Stick to CPU processing")
+        best_gpu = None
+        for gpu in gpus:
+            if gpu.cuda_capable and (best_gpu is None or gpu.memory_total > best_gpu.memory_total):
+                best_gpu = gpu
+        if best_gpu:
+            recommendations.append(_pick_tier(_GPU_TIERS, best_gpu.memory_total, strict=True).format(best_gpu.name))
         else:
             recommendations.append("❌ No CUDA GPU detected - Use optimized CPU processing")
         
         # Memory recommendations
-        if memory.total_gb >= 16:
-            recommendations.append(f"✅ Plenty of RAM: {memory.total_gb:.1f}GB - Can use larger models")
-        elif memory.total_gb >= 8:
-            recommendations.append(f"⚠️ Adequate RAM: {memory.total_gb:.1f}GB - Use medium models")
-        else:
-            recommendations.append(f"⚠️ Limited RAM: {memory.total_gb:.1f}GB - Use small models only")
+        recommendations.append(_pick_tier(_RAM_TIERS, memory.total_gb).format(memory.total_gb))
         
         # Framework recommendations
         if ai_frameworks.get('pytorch_cuda'):
@@ -231,10 +296,10 @@ class SystemProfiler:
         ai_frameworks = self.get_ai_framework_support()
         
         os_info = {
-            'system': platform.system(),
-            'version': platform.version(),
-            'machine': platform.machine(),
-            'processor': platform.processor()
+            'system': _system_static()['system'],
+            'version': _system_static()['version'],
+            'machine': _system_static()['machine'],
+            'processor': _system_static()['processor']
         }
         
         recommendations = self.generate_recommendations(cpu, gpus, memory, ai_frameworks)
@@ -252,22 +317,24 @@ class SystemProfiler:
     def _check_cuda(self) -> bool:
         """Check if CUDA is available"""
         try:
-            result = subprocess.run(['nvidia-smi'], capture_output=True, text=True)
+            result = run_hidden(['nvidia-smi'], capture_output=True, text=True,
+                                timeout=SUBPROCESS_TIMEOUT)
             return result.returncode == 0
-        except FileNotFoundError:
+        except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
     
     def _get_cpu_details_powershell(self) -> Dict[str, Any]:
         """Get detailed CPU info via PowerShell"""
         try:
             cmd = '''
-            Get-WmiObject -Class Win32_Processor | Select-Object Name, Architecture, NumberOfCores, NumberOfLogicalProcessors | ConvertTo-Json
+            Get-CimInstance -ClassName Win32_Processor | Select-Object Name, Architecture, NumberOfCores, NumberOfLogicalProcessors | ConvertTo-Json -Compress
             '''
-            result = subprocess.run(['powershell', '-Command', cmd], 
-                                  capture_output=True, text=True, shell=False)
+            result = run_hidden(['powershell', '-NoProfile', '-NonInteractive', '-Command', cmd],
+                                capture_output=True, text=True,
+                                timeout=SUBPROCESS_TIMEOUT)
             
             if result.returncode == 0 and result.stdout.strip():
-                data = json.loads(result.stdout.strip())
+                data = _json.loads(result.stdout)
                 if isinstance(data, list):
                     data = data[0]
                 
@@ -285,89 +352,61 @@ class SystemProfiler:
         """Get NVIDIA GPU information"""
         gpus = []
         try:
-            # Try nvidia-ml-py first
-            try:
-                import pynvml
-                pynvml.nvmlInit()
-                device_count = pynvml.nvmlDeviceGetCount()
-                
-                for i in range(device_count):
-                    handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                    name = pynvml.nvmlDeviceGetName(handle).decode('utf-8')
-                    
-                    # Memory info
-                    mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                    memory_total = mem_info.total // (1024 * 1024)  # MB
-                    memory_free = mem_info.free // (1024 * 1024)   # MB
-                    
-                    # Utilization
-                    util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                    usage_percent = util.gpu
-                    
-                    # Temperature
-                    try:
-                        temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
-                    except:
-                        temp = None
-                    
-                    # CUDA capability
-                    major, minor = pynvml.nvmlDeviceGetCudaComputeCapability(handle)
-                    compute_capability = f"{major}.{minor}"
-                    
-                    gpus.append(GPUInfo(
-                        name=name,
-                        driver_version="Unknown",
-                        memory_total=memory_total,
-                        memory_free=memory_free,
-                        cuda_capable=True,
-                        cuda_version=None,
-                        compute_capability=compute_capability,
-                        usage_percent=usage_percent,
-                        temperature=temp
-                    ))
-                
-            except ImportError:
+            # Try nvidia-ml-py first, in a throwaway process so the parent stays CUDA-clean
+            nvml_gpus = self._probe_nvml_isolated()
+            if nvml_gpus is not None:
+                gpus.extend(nvml_gpus)
+            else:
                 # Fallback to nvidia-smi
-                result = subprocess.run([
+                result = run_hidden([
                     'nvidia-smi', '--query-gpu=name,memory.total,memory.free,utilization.gpu,temperature.gpu',
                     '--format=csv,noheader,nounits'
-                ], capture_output=True, text=True)
+                ], capture_output=True, text=True,
+                   timeout=SUBPROCESS_TIMEOUT)
                 
                 if result.returncode == 0:
-                    for line in result.stdout.strip().split('\n'):
-                        if line:
-                            parts = [p.strip() for p in line.split(',')]
-                            if len(parts) >= 5:
-                                gpus.append(GPUInfo(
-                                    name=parts[0],
-                                    driver_version="Unknown",
-                                    memory_total=int(parts[1]),
-                                    memory_free=int(parts[2]),
-                                    cuda_capable=True,
-                                    cuda_version=None,
-                                    compute_capability=None,
-                                    usage_percent=float(parts[3]),
-                                    temperature=float(parts[4]) if parts[4] != '[Not Supported]' else None
-                                ))
+                    gpus.extend(_parse_nvidia_smi_csv(result.stdout))
                 
         except Exception as e:
             print(f"⚠️ NVIDIA GPU detection error: {e}")
         
         return gpus
     
+    def _probe_nvml_isolated(self) -> Optional[List[GPUInfo]]:
+        """Run the NVML probe in a spawned process; None means NVML is unusable"""
+        # Only hosts that actually have pynvml pay for spawning an interpreter
+        if importlib.util.find_spec("pynvml") is None:
+            return None
+        
+        import multiprocessing
+        ctx = multiprocessing.get_context('spawn')
+        queue = ctx.Queue()
+        process = ctx.Process(target=_nvml_probe_worker, args=(queue,), daemon=True)
+        process.start()
+        try:
+            return queue.get(timeout=NVML_PROBE_TIMEOUT)
+        except Empty:
+            print(f"⚠️ NVML probe timed out after {NVML_PROBE_TIMEOUT}s, falling back to nvidia-smi")
+            return None
+        finally:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+    
     def _get_other_gpus_powershell(self) -> List[GPUInfo]:
         """Get Intel/AMD GPU info via PowerShell"""
         gpus = []
         try:
             cmd = '''
-            Get-WmiObject -Class Win32_VideoController | Where-Object {$_.Name -notmatch "NVIDIA"} | 
-            Select-Object Name, AdapterRAM | ConvertTo-Json
+            Get-CimInstance -ClassName Win32_VideoController | Where-Object {$_.Name -notmatch "NVIDIA"} | 
+            Select-Object Name, AdapterRAM | ConvertTo-Json -Compress
             '''
-            result = subprocess.run(['powershell', '-Command', cmd], 
-                                  capture_output=True, text=True, shell=False)
+            result = run_hidden(['powershell', '-NoProfile', '-NonInteractive', '-Command', cmd],
+                                capture_output=True, text=True,
+                                timeout=SUBPROCESS_TIMEOUT)
             
             if result.returncode == 0 and result.stdout.strip():
-                data = json.loads(result.stdout.strip())
+                data = _json.loads(result.stdout)
                 if not isinstance(data, list):
                     data = [data]
                 
@@ -394,12 +433,36 @@ class SystemProfiler:
         
         return gpus
     
+    def _get_cpu_frequency(self) -> Tuple[float, float]:
+        """Get (current, max) CPU frequency in MHz"""
+        # On Linux psutil.cpu_freq() walks one sysfs directory per core, which
+        # is slow on many-core hosts; /proc/cpuinfo has every core in one read
+        if _system_static()['system'] == 'Linux':
+            try:
+                with open('/proc/cpuinfo') as f:
+                    mhz = [float(line.split(':', 1)[1]) for line in f if line.startswith('cpu MHz')]
+                if mhz:
+                    current = sum(mhz) / len(mhz)
+                    try:
+                        with open('/sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq') as f:
+                            maximum = int(f.read()) / 1000  # kHz -> MHz
+                    except (OSError, ValueError):
+                        maximum = max(mhz)
+                    return current, maximum
+            except (OSError, ValueError):
+                pass
+        
+        cpu_freq = _psutil().cpu_freq()
+        if cpu_freq:
+            return cpu_freq.current, cpu_freq.max
+        return 0, 0
+    
     def _get_cpu_temperature(self) -> Optional[float]:
         """Get CPU temperature if available"""
         try:
             # Try psutil sensors
-            if hasattr(psutil, 'sensors_temperatures'):
-                temps = psutil.sensors_temperatures()
+            if hasattr(_psutil(), 'sensors_temperatures'):
+                temps = _psutil().sensors_temperatures()
                 if temps:
                     for name, entries in temps.items():
                         if 'cpu' in name.lower() or 'core' in name.lower():
@@ -423,6 +486,85 @@ class SystemProfiler:
         )
 
 
+def _parse_nvidia_smi_csv(output: str) -> List[GPUInfo]:
+    """Parse `nvidia-smi --query-gpu=name,memory.total,memory.free,utilization.gpu,temperature.gpu` CSV rows"""
+    gpus = []
+    for row in csv.reader(io.StringIO(output), skipinitialspace=True):
+        if len(row) < 5:
+            continue
+        name, memory_total, memory_free, usage, temperature = row[:5]
+        gpus.append(GPUInfo(
+            name=name.strip(),
+            driver_version="Unknown",
+            memory_total=int(memory_total),
+            memory_free=int(memory_free),
+            cuda_capable=True,
+            cuda_version=None,
+            compute_capability=None,
+            usage_percent=float(usage),
+            temperature=float(temperature) if temperature != '[Not Supported]' else None
+        ))
+    return gpus
+
+
+def _nvml_probe_worker(queue) -> None:
+    """Query NVML in a child process and put a list of GPUInfo (or None) on the queue"""
+    try:
+        import pynvml
+    except ImportError:
+        queue.put(None)
+        return
+    
+    gpus = []
+    try:
+        pynvml.nvmlInit()
+        try:
+            device_count = pynvml.nvmlDeviceGetCount()
+            
+            for i in range(device_count):
+                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+                name = pynvml.nvmlDeviceGetName(handle)
+                if isinstance(name, bytes):
+                    name = name.decode('utf-8')
+                
+                # Memory info
+                mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                memory_total = mem_info.total // (1024 * 1024)  # MB
+                memory_free = mem_info.free // (1024 * 1024)   # MB
+                
+                # Utilization
+                util = pynvml.nvmlDeviceGetUtilizationRates(handle)
+                usage_percent = util.gpu
+                
+                # Temperature
+                try:
+                    temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+                except Exception:
+                    temp = None
+                
+                # CUDA capability
+                major, minor = pynvml.nvmlDeviceGetCudaComputeCapability(handle)
+                compute_capability = f"{major}.{minor}"
+                
+                gpus.append(GPUInfo(
+                    name=name,
+                    driver_version="Unknown",
+                    memory_total=memory_total,
+                    memory_free=memory_free,
+                    cuda_capable=True,
+                    cuda_version=None,
+                    compute_capability=compute_capability,
+                    usage_percent=usage_percent,
+                    temperature=temp
+                ))
+        finally:
+            pynvml.nvmlShutdown()
+    except Exception as e:
+        print(f"⚠️ NVML probe error: {e}")
+    
+    queue.put(gpus)
+
+
 # Convenience functions for easy import/use
 def quick_cpu_check() -> CPUInfo:
     """Quick CPU diagnostics"""
@@ -443,37 +585,44 @@ def print_diagnostics():
     """Print formatted diagnostics to console"""
     diag = quick_system_check()
     
-    print("\n" + "="*60)
-    print("🖥️  SYSTEM PERFORMANCE DIAGNOSTICS")
-    print("="*60)
+    # Build the whole report first and emit it with a single write
+    buf = io.StringIO()
+    buf.write("\n" + "="*60 + "\n")
+    buf.write("🖥️  SYSTEM PERFORMANCE DIAGNOSTICS\n")
+    buf.write("="*60 + "\n")
     
-    print(f"\n💻 CPU: {diag.cpu.brand}")
-    print(f"   Cores: {diag.cpu.cores_physical} physical, {diag.cpu.cores_logical} logical")
-    print(f"   Usage: {diag.cpu.usage_percent}%")
-    print(f"   Frequency: {diag.cpu.frequency_current:.0f} MHz")
+    buf.write(f"\n💻 CPU: {diag.cpu.brand}\n")
+    buf.write(f"   Cores: {diag.cpu.cores_physical} physical, {diag.cpu.cores_logical} logical\n")
+    buf.write(f"   Usage: {diag.cpu.usage_percent}%\n")
+    buf.write(f"   Frequency: {diag.cpu.frequency_current:.0f} MHz\n")
     
-    print(f"\n🎮 GPUs ({len(diag.gpus)}):")
+    buf.write(f"\n🎮 GPUs ({len(diag.gpus)}):\n")
     for i, gpu in enumerate(diag.gpus):
         cuda_status = "✅ CUDA" if gpu.cuda_capable else "❌ No CUDA"
-        print(f"   {i+1}. {gpu.name}")
-        print(f"      Memory: {gpu.memory_total}MB | {cuda_status}")
-        print(f"      Usage: {gpu.usage_percent}%")
+        buf.write(f"   {i+1}. {gpu.name}\n")
+        buf.write(f"      Memory: {gpu.memory_total}MB | {cuda_status}\n")
+        buf.write(f"      Usage: {gpu.usage_percent}%\n")
     
-    print(f"\n💾 Memory:")
-    print(f"   Total: {diag.memory.total_gb:.1f}GB")
-    print(f"   Available: {diag.memory.available_gb:.1f}GB ({100-diag.memory.usage_percent:.1f}%)")
+    buf.write(f"\n💾 Memory:\n")
+    buf.write(f"   Total: {diag.memory.total_gb:.1f}GB\n")
+    buf.write(f"   Available: {diag.memory.available_gb:.1f}GB ({100-diag.memory.usage_percent:.1f}%)\n")
     
-    print(f"\n🤖 AI Frameworks:")
+    buf.write(f"\n🤖 AI Frameworks:\n")
     for framework, available in diag.ai_frameworks.items():
         status = "✅" if available else "❌"
-        print(f"   {status} {framework}")
+        buf.write(f"   {status} {framework}\n")
     
-    print(f"\n💡 Recommendations:")
+    buf.write(f"\n💡 Recommendations:\n")
     for rec in diag.recommendations:
-        print(f"   {rec}")
+        buf.write(f"   {rec}\n")
     
-    print("\n" + "="*60)
-
+    buf.write("\n" + "="*60 + "\n")
+    
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
+    # The NVML probe spawns a child process; required for frozen Windows builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     print_diagnostics()
\ No newline at end of file
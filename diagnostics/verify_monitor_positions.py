@@ -4,48 +4,253 @@ Verify Windows Monitor Positions
 Shows exactly what Windows reports for each monitor position
 """
 
-import subprocess
-import json
+import os
+import re
+import shutil
+from collections import defaultdict
 from pathlib import Path
 
-def get_detailed_monitor_info():
+# Importable both as diagnostics.<module> and as a script run from diagnostics/
+try:
+    from .hidden_process import run_hidden
+except ImportError:
+    from hidden_process import run_hidden
+
+# orjson is a drop-in, faster parser for the PowerShell / cache JSON
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# Monitor layout rarely changes between runs, so results are cached and reused
+# while GetSystemMetrics reports the same monitor count and virtual-screen bounds
+MONITOR_CACHE_FILE = Path.home() / ".cache" / "fyemeetrec" / "monitors.json"
+SYSTEM_METRICS = (80, 76, 77, 78, 79)  # SM_CMONITORS, SM_[XY]VIRTUALSCREEN, SM_C[XY]VIRTUALSCREEN
+
+MANUFACTURER_CODES = {
+    'LEN': 'Lenovo', 'HKC': 'Koorui', 'ACR': 'Acer', 'SAM': 'Samsung',
+    'DEL': 'Dell', 'AOC': 'AOC', 'BNQ': 'BenQ', 'ASU': 'ASUS',
+    'MSI': 'MSI', 'GSM': 'LG', 'LG': 'LG', 'HP': 'HP', 'YCT': 'Unknown'
+}
+# One anchored alternation instead of per-length prefix lookups; longest codes
+# first so a 3-letter PNP ID wins over a 2-letter legacy prefix
+MANUFACTURER_RE = re.compile(
+    '|'.join(sorted(map(re.escape, MANUFACTURER_CODES), key=len, reverse=True))
+)
+
+# Fallback when the native Win32 query is unavailable: screen bounds and WMI
+# monitor IDs are fetched by one PowerShell process, since each cold start
+# costs around a second. PowerShell 7 starts noticeably faster than 5.1.
+POWERSHELL = shutil.which('pwsh') or 'powershell'
+POWERSHELL_ARGS = (POWERSHELL, '-NoLogo', '-NoProfile', '-NonInteractive', '-Sta', '-Command')
+MONITOR_QUERY_PS = '''
+Add-Type -AssemblyName System.Windows.Forms
+$screens = [System.Windows.Forms.Screen]::AllScreens
+$result = @()
+for ($i = 0; $i -lt $screens.Length; $i++) {
+    $screen = $screens[$i]
+    $result += [PSCustomObject]@{
+        Index = $i
+        DeviceName = $screen.DeviceName
+        Primary = $screen.Primary
+        X = $screen.Bounds.X
+        Y = $screen.Bounds.Y
+        Width = $screen.Bounds.Width
+        Height = $screen.Bounds.Height
+        Left = $screen.Bounds.Left
+        Right = $screen.Bounds.Right
+        Top = $screen.Bounds.Top
+        Bottom = $screen.Bounds.Bottom
+    }
+}
+$wmi = @(Get-CimInstance -Namespace root\\wmi -ClassName WmiMonitorID |
+    Select-Object InstanceName, ManufacturerName, UserFriendlyName | ForEach-Object {
+    $mfgCode = ($_.ManufacturerName | Where-Object {$_ -ne 0} | ForEach-Object {[char]$_}) -join '';
+    $modelName = ($_.UserFriendlyName | Where-Object {$_ -ne 0} | ForEach-Object {[char]$_}) -join '';
+    [PSCustomObject]@{
+        InstanceName = $_.InstanceName;
+        ManufacturerCode = $mfgCode;
+        ModelName = $modelName
+    }
+})
+@{screens = @($result); wmi = $wmi} | ConvertTo-Json -Depth 4 -Compress
+'''
+
+def _topology_fingerprint():
+    """Cheap layout fingerprint: monitor count plus the virtual-screen rectangle"""
+    import ctypes
+    user32 = ctypes.windll.user32
+    return [user32.GetSystemMetrics(metric) for metric in SYSTEM_METRICS]
+
+def _load_cached_monitors():
+    """Return cached (screens, wmi_entries) if the monitor layout is unchanged, else None"""
+    if os.name != 'nt' or not MONITOR_CACHE_FILE.exists():
+        return None
+    try:
+        cached = _loads(MONITOR_CACHE_FILE.read_bytes())
+        if cached.get('fingerprint') == _topology_fingerprint() and cached.get('screens'):
+            return cached['screens'], cached.get('wmi', [])
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable monitor cache: {e}")
+    return None
+
+def _save_cached_monitors(screens, wmi):
+    """Persist the queried topology next to its fingerprint"""
+    if os.name != 'nt' or not screens:
+        return
+    import json
+    
+    try:
+        MONITOR_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        MONITOR_CACHE_FILE.write_text(json.dumps({
+            'fingerprint': _topology_fingerprint(),
+            'screens': screens,
+            'wmi': wmi
+        }), encoding='utf-8')
+    except Exception as e:
+        print(f"⚠️ Could not write monitor cache: {e}")
+
+def query_monitors(force_refresh=False):
+    """Return (screens, wmi_entries), from cache when the layout hasn't changed"""
+    if not force_refresh:
+        cached = _load_cached_monitors()
+        if cached:
+            print(f"📦 Using cached monitor topology ({MONITOR_CACHE_FILE})")
+            return cached
+    
+    screens, wmi = _query_monitors_live()
+    _save_cached_monitors(screens, wmi)
+    return screens, wmi
+
+def _query_monitors_live():
+    """Query the OS, preferring the native Win32 path over PowerShell"""
+    if os.name == 'nt':
+        try:
+            return _query_screens_native(), _query_edid_registry()
+        except Exception as e:
+            print(f"⚠️ Native monitor query failed, falling back to PowerShell: {e}")
+    return _query_monitors_powershell()
+
+def _query_screens_native():
+    """Enumerate monitors via user32!EnumDisplayMonitors, in Screen.AllScreens shape"""
+    import ctypes
+    from ctypes import wintypes
+    
+    class MONITORINFOEXW(ctypes.Structure):
+        _fields_ = [
+            ('cbSize', wintypes.DWORD),
+            ('rcMonitor', wintypes.RECT),
+            ('rcWork', wintypes.RECT),
+            ('dwFlags', wintypes.DWORD),
+            ('szDevice', wintypes.WCHAR * 32),
+        ]
+    
+    MONITORINFOF_PRIMARY = 1
+    MONITORENUMPROC = ctypes.WINFUNCTYPE(
+        wintypes.BOOL, wintypes.HMONITOR, wintypes.HDC, ctypes.POINTER(wintypes.RECT), wintypes.LPARAM
+    )
+    user32 = ctypes.windll.user32
+    screens = []
+    
+    def callback(hmonitor, hdc, rect, lparam):
+        info = MONITORINFOEXW()
+        info.cbSize = ctypes.sizeof(MONITORINFOEXW)
+        if user32.GetMonitorInfoW(hmonitor, ctypes.byref(info)):
+            bounds = info.rcMonitor
+            screens.append({
+                'Index': len(screens),
+                'DeviceName': info.szDevice,
+                'Primary': bool(info.dwFlags & MONITORINFOF_PRIMARY),
+                'X': bounds.left,
+                'Y': bounds.top,
+                'Width': bounds.right - bounds.left,
+                'Height': bounds.bottom - bounds.top,
+                'Left': bounds.left,
+                'Right': bounds.right,
+                'Top': bounds.top,
+                'Bottom': bounds.bottom,
+            })
+        return True
+    
+    if not user32.EnumDisplayMonitors(None, None, MONITORENUMPROC(callback), 0):
+        raise ctypes.WinError()
+    return screens
+
+def _query_edid_registry():
+    """Read EDID blobs of active displays from the registry, in WmiMonitorID shape"""
+    import winreg
+    
+    entries = []
+    display_root = r'SYSTEM\CurrentControlSet\Enum\DISPLAY'
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, display_root) as root:
+        for model_id in _iter_subkeys(winreg, root):
+            with winreg.OpenKey(root, model_id) as model_key:
+                for instance in _iter_subkeys(winreg, model_key):
+                    try:
+                        # Only currently attached devices have a Control subkey
+                        winreg.OpenKey(model_key, f'{instance}\\Control').Close()
+                        with winreg.OpenKey(model_key, f'{instance}\\Device Parameters') as params:
+                            edid, _ = winreg.QueryValueEx(params, 'EDID')
+                    except OSError:
+                        continue
+                    
+                    edid = bytes(edid)
+                    if len(edid) < 128:
+                        continue
+                    entries.append({
+                        'InstanceName': f'DISPLAY\\{model_id}\\{instance}',
+                        'ManufacturerCode': _decode_edid_manufacturer(edid),
+                        'ModelName': _decode_edid_model_name(edid),
+                    })
+    return entries
+
+def _iter_subkeys(winreg, key):
+    """Yield the names of all subkeys of an open registry key"""
+    index = 0
+    while True:
+        try:
+            yield winreg.EnumKey(key, index)
+        except OSError:
+            return
+        index += 1
+
+def _decode_edid_manufacturer(edid):
+    """Decode the 3-letter PNP manufacturer ID from EDID bytes 8-9"""
+    value = (edid[8] << 8) | edid[9]
+    return ''.join(chr(((value >> shift) & 0x1F) + 64) for shift in (10, 5, 0))
+
+def _decode_edid_model_name(edid):
+    """Return the monitor name descriptor (tag 0xFC) from the EDID, if present"""
+    for offset in (54, 72, 90, 108):
+        block = edid[offset:offset + 18]
+        if block[:3] == b'\x00\x00\x00' and block[3] == 0xFC:
+            return block[5:].split(b'\x0a')[0].decode('ascii', errors='ignore').strip()
+    return ''
+
+def _query_monitors_powershell():
+    """Run the combined PowerShell query and return (screens, wmi_entries)"""
+    result = run_hidden([*POWERSHELL_ARGS, MONITOR_QUERY_PS], capture_output=True, text=True)
+    
+    if result.returncode != 0 or not result.stdout.strip():
+        return [], []
+    
+    data = _loads(result.stdout)
+    screens = data.get('screens') or []
+    wmi = data.get('wmi') or []
+    if isinstance(screens, dict):
+        screens = [screens]
+    if isinstance(wmi, dict):
+        wmi = [wmi]
+    return screens, wmi
+
+def get_detailed_monitor_info(force_refresh=False):
     """Get detailed monitor information from Windows"""
     print("🔍 Querying Windows for monitor positions...")
     
-    # Get monitor positions from Windows
-    ps_command = '''
-    Add-Type -AssemblyName System.Windows.Forms
-    $screens = [System.Windows.Forms.Screen]::AllScreens
-    $result = @()
-    for ($i = 0; $i -lt $screens.Length; $i++) {
-        $screen = $screens[$i]
-        $result += [PSCustomObject]@{
-            Index = $i
-            DeviceName = $screen.DeviceName
-            Primary = $screen.Primary
-            X = $screen.Bounds.X
-            Y = $screen.Bounds.Y
-            Width = $screen.Bounds.Width
-            Height = $screen.Bounds.Height
-            Left = $screen.Bounds.Left
-            Right = $screen.Bounds.Right
-            Top = $screen.Bounds.Top
-            Bottom = $screen.Bounds.Bottom
-        }
-    }
-    $result | ConvertTo-Json
-    '''
-    
     try:
-        result = subprocess.run([
-            'powershell', '-Command', ps_command
-        ], capture_output=True, text=True, shell=False)
+        monitors_data, wmi_data = query_monitors(force_refresh)
         
-        if result.returncode == 0:
-            monitors_data = json.loads(result.stdout.strip())
-            if isinstance(monitors_data, dict):
-                monitors_data = [monitors_data]
-            
+        if monitors_data:
             print(f"\n📺 Windows Reports {len(monitors_data)} Monitors:")
             print("=" * 80)
             
@@ -59,7 +264,7 @@ def get_detailed_monitor_info():
             
             # Now compare with manufacturer info
             print("\n🔍 Getting manufacturer information...")
-            manufacturer_info = get_manufacturer_info()
+            manufacturer_info = get_manufacturer_info(wmi_data)
             
             print("\n📊 COMPARISON TABLE:")
             print("=" * 100)
@@ -86,34 +291,10 @@ def get_detailed_monitor_info():
         print(f"❌ Error getting monitor info: {e}")
         return []
 
-def get_manufacturer_info():
-    """Get manufacturer info separately"""
+def get_manufacturer_info(wmi_data):
+    """Decode manufacturer info from WmiMonitorID entries"""
     try:
-        wmi_command = '''Get-WmiObject -Namespace root\\wmi -Class WmiMonitorID | ForEach-Object {
-            $mfgCode = ($_.ManufacturerName | Where-Object {$_ -ne 0} | ForEach-Object {[char]$_}) -join '';
-            $modelName = ($_.UserFriendlyName | Where-Object {$_ -ne 0} | ForEach-Object {[char]$_}) -join '';
-            [PSCustomObject]@{
-                InstanceName = $_.InstanceName;
-                ManufacturerCode = $mfgCode;
-                ModelName = $modelName
-            }
-        } | ConvertTo-Json'''
-        
-        result = subprocess.run([
-            'powershell', '-Command', wmi_command
-        ], capture_output=True, text=True, shell=False)
-        
-        if result.returncode == 0 and result.stdout.strip():
-            wmi_data = json.loads(result.stdout.strip())
-            if isinstance(wmi_data, dict):
-                wmi_data = [wmi_data]
-            
-            manufacturer_codes = {
-                'LEN': 'Lenovo', 'HKC': 'Koorui', 'ACR': 'Acer', 'SAM': 'Samsung',
-                'DEL': 'Dell', 'AOC': 'AOC', 'BNQ': 'BenQ', 'ASU': 'ASUS',
-                'MSI': 'MSI', 'GSM': 'LG', 'LG': 'LG', 'HP': 'HP', 'YCT': 'Unknown'
-            }
-            
+        if wmi_data:
             manufacturers = []
             for item in wmi_data:
                 instance_name = item.get('InstanceName', '')
@@ -123,15 +304,11 @@ def get_manufacturer_info():
                     parts = instance_name.split('\\')
                     if len(parts) > 1:
                         manufacturer_part = parts[1]
-                        manufacturer_code = None
+                        match = MANUFACTURER_RE.match(manufacturer_part)
                         
-                        for code in manufacturer_codes.keys():
-                            if manufacturer_part.startswith(code):
-                                manufacturer_code = code
-                                break
-                        
-                        if manufacturer_code:
-                            brand = manufacturer_codes[manufacturer_code]
+                        if match:
+                            manufacturer_code = match.group()
+                            brand = MANUFACTURER_CODES[manufacturer_code]
                             display_model = model_name if model_name else manufacturer_part[len(manufacturer_code):]
                             
                             manufacturers.append({
@@ -147,7 +324,7 @@ def get_manufacturer_info():
     
     return []
 
-def main():
+def main(force_refresh=False):
     """Main verification function"""
     print("🔍 MONITOR POSITION VERIFICATION")
     print("=" * 50)
@@ -155,20 +332,21 @@ def main():
     print("and help us understand why FFmpeg might be recording the wrong monitor.")
     print()
     
-    monitors = get_detailed_monitor_info()
+    monitors = get_detailed_monitor_info(force_refresh)
     
     if monitors:
         print("\n🤔 ANALYSIS:")
         print("=" * 50)
         
         # Check for duplicate positions
-        positions = [(m['X'], m['Y']) for m in monitors]
-        duplicates = [pos for pos in set(positions) if positions.count(pos) > 1]
+        position_groups = defaultdict(list)
+        for i, m in enumerate(monitors):
+            position_groups[(m['X'], m['Y'])].append(i)
+        duplicates = {pos: idxs for pos, idxs in position_groups.items() if len(idxs) > 1}
         
         if duplicates:
             print("⚠️  WARNING: Found duplicate monitor positions!")
-            for pos in duplicates:
-                matching_monitors = [i for i, m in enumerate(monitors) if (m['X'], m['Y']) == pos]
+            for pos, matching_monitors in duplicates.items():
                 print(f"   Position {pos} is used by monitors: {matching_monitors}")
                 print("   This explains why FFmpeg might record the wrong monitor!")
         else:
@@ -176,11 +354,7 @@ def main():
         
         # Show which monitor is at the recorded position
         target_position = (-1920, 0)
-        matching_monitor = None
-        for i, monitor in enumerate(monitors):
-            if (monitor['X'], monitor['Y']) == target_position:
-                matching_monitor = i
-                break
+        matching_monitor = position_groups.get(target_position, [None])[0]
         
         if matching_monitor is not None:
             print(f"\n🎯 Monitor at position {target_position} (where FFmpeg recorded):")
@@ -199,4 +373,10 @@ def main():
     print("your physical setup.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Verify Windows monitor positions")
+    parser.add_argument('--force-refresh', action='store_true',
+                        help='Ignore the cached monitor topology and query Windows again')
+    args = parser.parse_args()
+    main(force_refresh=args.force_refresh)
\ No newline at end of file
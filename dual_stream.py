@@ -4,18 +4,15 @@ Dual-Mode Client: Real-time Transcription + Local Video Recording
 Audio (VoiceMeeter B1) → Faster-Whisper → Server + Local Video
 """
 
+import os
 import subprocess
 import sys
 import time
 import threading
-import argparse
-import json
-import requests
 import queue
 import numpy as np
-import os
+from functools import lru_cache
 from pathlib import Path
-from faster_whisper import WhisperModel
 from logging_config import dual_stream_logger as logger, ffmpeg_logger
 
 def get_base_dir():
@@ -27,10 +24,9 @@ def get_base_dir():
         # Running as normal Python script
         return Path(__file__).parent.absolute()
 
+@lru_cache(maxsize=1)
 def get_ffmpeg_path():
-    """Get the path to the local FFmpeg executable"""
-    import sys
-    
+    """Get the path to the local FFmpeg executable (resolved once per process)"""
     # Determine the base directory
     if getattr(sys, 'frozen', False):
         # Running as PyInstaller bundle - ffmpeg is in _internal
@@ -49,19 +45,310 @@ def get_ffmpeg_path():
         logger.warning(f" Local FFmpeg not found at {ffmpeg_path}, using system FFmpeg")
         return "ffmpeg"
 
+# Default live transcription window (the transcribe_window_seconds setting or
+# --window override it) and the audio shared between consecutive windows
+TRANSCRIBE_WINDOW_SECONDS = 15
+TRANSCRIBE_OVERLAP_SECONDS = 1
+# New audio left over when transcription stops is transcribed if at least this long
+TRANSCRIBE_MIN_TAIL_SECONDS = 0.5
+# Upper bound on VAD chunks encoded together when a backlog is transcribed at once
+TRANSCRIBE_BATCH_SIZE = 4
+# Peak level (about -80 dBFS) below which a window is digital silence, e.g. a
+# muted bus; such windows skip Whisper and its VAD pass entirely
+SILENCE_PEAK = 1e-4
+# Transcription backlog kept before the oldest audio is dropped (2**20 samples, ~65 s)
+AUDIO_RING_SAMPLES = 1 << 20
+# Built once rather than per window. Greedy, single temperature: no fallback
+# re-decodes on noisy audio, and the VAD skips silent stretches before the
+# encoder runs. Timestamps are kept to de-duplicate overlapping windows. No
+# prompt carries over between windows, so decoder context stays flat over
+# long meetings instead of growing with the transcript.
+TRANSCRIBE_OPTIONS = dict(
+    beam_size=1, language="en",
+    temperature=0.0, condition_on_previous_text=False, initial_prompt=None, prefix=None,
+    without_timestamps=False, batch_size=TRANSCRIBE_BATCH_SIZE,
+    vad_filter=True, vad_parameters=dict(min_silence_duration_ms=500),
+)
+# ffmpeg converts transcription audio to 16 kHz mono float32 itself, in C,
+# so the bytes read from its pipe are already what Whisper consumes
+# -flush_packets hands each packet to the pipe at once instead of filling a 32 KB AVIO buffer first
+TRANSCRIBE_PCM_ARGS = ("-ac", "1", "-ar", "16000", "-f", "f32le", "-flush_packets", "1")
+
+# Capture devices deliver a fixed, known format, so skip ffmpeg's default
+# 5 MB / 5 s stream probing before each live input (per-input options)
+FAST_PROBE_ARGS = ("-probesize", "32", "-analyzeduration", "0")
+
+@lru_cache(maxsize=1)
+def get_ffmpeg_encoders():
+    """Names of the encoders compiled into FFmpeg, probed once per process"""
+    try:
+        result = subprocess.run([get_ffmpeg_path(), "-hide_banner", "-encoders"],
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f" Could not list FFmpeg encoders: {e}")
+        return frozenset()
+    
+    encoders = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        # Encoder rows look like " V....D libx265   libx265 H.265 / HEVC"
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] in "VAS" and parts[1] != "=":
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+PROCESS_SET_INFORMATION = 0x0200
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+@lru_cache(maxsize=1)
+def get_kernel32():
+    """Private kernel32 handle with declared prototypes, so 64-bit HANDLEs are not truncated to int"""
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    kernel32.GetProcessAffinityMask.argtypes = (wintypes.HANDLE, ctypes.POINTER(ctypes.c_size_t),
+                                                ctypes.POINTER(ctypes.c_size_t))
+    kernel32.GetProcessAffinityMask.restype = wintypes.BOOL
+    kernel32.SetProcessAffinityMask.argtypes = (wintypes.HANDLE, ctypes.c_size_t)
+    kernel32.SetProcessAffinityMask.restype = wintypes.BOOL
+    kernel32.GetCurrentThread.argtypes = ()
+    kernel32.GetCurrentThread.restype = wintypes.HANDLE
+    kernel32.SetThreadPriority.argtypes = (wintypes.HANDLE, ctypes.c_int)
+    kernel32.SetThreadPriority.restype = wintypes.BOOL
+    return kernel32
+
+def _open_process(pid, access):
+    """OpenProcess that raises on failure; the caller closes the handle"""
+    import ctypes
+    handle = get_kernel32().OpenProcess(access, False, pid)
+    if not handle:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return handle
+
+def get_process_affinity(pid):
+    """CPU indexes a process may run on, or None if unknown"""
+    try:
+        if hasattr(os, "sched_getaffinity"):
+            return set(os.sched_getaffinity(pid))
+        if os.name == "nt":
+            import ctypes
+            kernel32 = get_kernel32()
+            handle = _open_process(pid, PROCESS_QUERY_LIMITED_INFORMATION)
+            try:
+                process_mask = ctypes.c_size_t()
+                system_mask = ctypes.c_size_t()
+                if not kernel32.GetProcessAffinityMask(handle, ctypes.byref(process_mask), ctypes.byref(system_mask)):
+                    raise ctypes.WinError(ctypes.get_last_error())
+            finally:
+                kernel32.CloseHandle(handle)
+            # Bits of the processor group the process runs in (at most 64 CPUs)
+            return {cpu for cpu in range(ctypes.sizeof(ctypes.c_size_t) * 8) if process_mask.value >> cpu & 1}
+    except Exception as e:
+        logger.debug(f" Could not read CPU affinity for PID {pid}: {e}")
+    return None
+
+def get_cpu_split():
+    """Disjoint (ffmpeg, whisper) sets of the CPUs this process may use, or None when too few to split"""
+    cpus = get_process_affinity(os.getpid())
+    if not cpus:
+        cpus = range(min(os.cpu_count() or 1, 64))  # one Windows processor group
+    cpus = sorted(cpus)
+    if len(cpus) < 4:
+        return None
+    half = len(cpus) // 2
+    return set(cpus[:half]), set(cpus[half:])
+
+def set_process_affinity(pid, cpus):
+    """Restrict a process to the given CPU indexes (best effort)"""
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(pid, cpus)
+        elif os.name == "nt":
+            import ctypes
+            kernel32 = get_kernel32()
+            handle = _open_process(pid, PROCESS_SET_INFORMATION | PROCESS_QUERY_LIMITED_INFORMATION)
+            try:
+                mask = sum(1 << cpu for cpu in cpus)
+                if not kernel32.SetProcessAffinityMask(handle, mask):
+                    raise ctypes.WinError(ctypes.get_last_error())
+            finally:
+                kernel32.CloseHandle(handle)
+        else:
+            return False
+        return True
+    except Exception as e:
+        logger.debug(f" Could not set CPU affinity for PID {pid}: {e}")
+        return False
+
+def raise_current_thread_priority():
+    """Run the calling thread above normal priority so it is not starved by Whisper (best effort, Windows only)"""
+    if os.name != "nt":
+        return False
+    try:
+        import ctypes
+        kernel32 = get_kernel32()
+        THREAD_PRIORITY_ABOVE_NORMAL = 1
+        if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_ABOVE_NORMAL):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return True
+    except Exception as e:
+        logger.debug(f" Could not raise thread priority: {e}")
+        return False
+
+def get_whisper_device_options(allow_cuda=True):
+    """WhisperModel device/compute options for this machine
+    
+    INT8 weights with FP16 activations on CUDA; plain INT8 on CPU, where
+    CTranslate2 already keeps FP32 activations (int8_float32). CPU threads come
+    from the whisper_cpu_threads setting, else one per core Whisper gets while
+    recording (CTranslate2's default is far fewer). INT8 falls back to AVX2
+    kernels on CPUs without VNNI, so it is safe everywhere.
+    """
+    if allow_cuda:
+        try:
+            import ctranslate2
+            if ctranslate2.get_cuda_device_count() > 0:
+                return {"device": "cuda", "compute_type": "int8_float16", "num_workers": 1}
+        except Exception as e:
+            logger.debug(f" CUDA probe failed, using CPU: {e}")
+    from settings_config import settings_manager
+    cpu_threads = settings_manager.get_whisper_cpu_threads()
+    if not cpu_threads:
+        cpu_split = get_cpu_split()
+        cpu_threads = len(cpu_split[1]) if cpu_split else (os.cpu_count() or 0)
+    return {"device": "cpu", "compute_type": "int8", "cpu_threads": cpu_threads, "num_workers": 1}
+
+# Hardware encoders tried before software, in order; each needs a working GPU/driver
+HARDWARE_VIDEO_ENCODERS = ("hevc_nvenc", "h264_nvenc", "hevc_qsv", "h264_amf")
+
+@lru_cache(maxsize=None)
+def ffmpeg_encoder_works(encoder):
+    """True if a one-frame test encode succeeds - builds ship NVENC/QSV/AMF regardless of hardware"""
+    cmd = [
+        get_ffmpeg_path(), "-hide_banner", "-loglevel", "error",
+        "-f", "lavfi", "-i", "color=black:s=256x256", "-frames:v", "1",
+        "-c:v", encoder, "-f", "null", "-"
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug(f" Encoder probe for {encoder} failed: {e}")
+        return False
+    return result.returncode == 0
+
+
+class AudioRing:
+    """Single-producer/single-consumer float32 sample ring for the transcription path
+    
+    The capture thread appends samples and the transcription thread copies out
+    windows, consuming less than it copies so the window overlap simply stays in
+    the ring. A full ring drops the oldest audio instead of blocking capture.
+    Python has no atomics, so head/tail updates and copies share one Condition;
+    each copy is a single memcpy, so the lock is held only briefly.
+    """
+    
+    def __init__(self, capacity):
+        if capacity & (capacity - 1):
+            raise ValueError("AudioRing capacity must be a power of two")
+        self.buffer = np.empty(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.head = 0  # samples written
+        self.tail = 0  # samples consumed
+        self.closed = False
+        self._cond = threading.Condition()
+    
+    def reset(self):
+        """Empty the ring and reopen it for a new session"""
+        with self._cond:
+            self.head = self.tail = 0
+            self.closed = False
+    
+    def close(self):
+        """Wake a waiting reader; wait_for() returns None from now on"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+    
+    def write(self, samples):
+        """Append samples; returns how many of the oldest unread samples were dropped"""
+        truncated = max(samples.shape[0] - self.capacity, 0)
+        samples = samples[truncated:]
+        count = samples.shape[0]
+        with self._cond:
+            start = self.head & self.mask
+            first = min(count, self.capacity - start)
+            self.buffer[start:start + first] = samples[:first]
+            self.buffer[:count - first] = samples[first:]
+            self.head += count
+            dropped = max(self.head - self.tail - self.capacity, 0)
+            self.tail += dropped
+            self._cond.notify()
+        return dropped + truncated
+    
+    def unread(self):
+        """Number of samples written but not yet consumed"""
+        with self._cond:
+            return self.head - self.tail
+    
+    def wait_for(self, count):
+        """Block until at least count samples are unread; returns the unread count, or None once closed"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.closed or self.head - self.tail >= count)
+            return None if self.closed else self.head - self.tail
+    
+    def read(self, count, consume, out=None):
+        """Copy out the oldest count samples and advance past the first consume of them
+        
+        The copy lands in out[:count] when a buffer is given, else in a new array.
+        Either way the result is one contiguous float32 array that faster-whisper
+        takes as is; a view into the ring itself would be overwritten by capture.
+        """
+        out = np.empty(count, dtype=np.float32) if out is None else out[:count]
+        with self._cond:
+            start = self.tail & self.mask
+            first = min(count, self.capacity - start)
+            out[:first] = self.buffer[start:start + first]
+            out[first:] = self.buffer[:count - first]
+            self.tail += consume
+        return out
+
 
 class DualModeStreamer:
-    def __init__(self, server_ip="localhost", server_port=8001, monitor_config=None):
+    def __init__(self, server_ip="localhost", server_port=8001, monitor_config=None, whisper_model=None,
+                 transcribe_window=None):
         self.server_ip = server_ip
         self.server_port = server_port
         
         # Get audio source from settings
         from settings_config import settings_manager
         self.audio_source = settings_manager.get_audio_source()
+        self.screen_capture = settings_manager.get_screen_capture()
+        self.video_encoder = None  # chosen in check_setup()
+        # Explicit argument, then WHISPER_MODEL, then the saved preference
+        self.whisper_model_name = (whisper_model or os.environ.get("WHISPER_MODEL")
+                                   or settings_manager.get_whisper_model())
+        # Whisper pads to 30 s either way: longer windows mean fewer calls, shorter ones lower latency
+        window_seconds = int(transcribe_window or settings_manager.get_transcribe_window()
+                             or TRANSCRIBE_WINDOW_SECONDS)
+        self.transcribe_window_seconds = min(max(window_seconds, TRANSCRIBE_OVERLAP_SECONDS + 1), 29)
         
+        # Bounded: if Whisper falls behind, the oldest audio is dropped instead of
+        # letting memory and transcript latency grow without limit
+        self.audio_ring = AudioRing(AUDIO_RING_SAMPLES)
+        self.dropped_samples = 0
+        # Worker threads block on these instead of polling the flags below
+        self._transcription_active = threading.Event()
+        self._recording_active = threading.Event()
+        self._recording_done = threading.Event()
         self.recording_active = False
         self.transcription_active = False
-        self.audio_queue = queue.Queue()
+        # Finished transcripts are handed to a sender thread so that whatever
+        # send_text_to_server does (app.py patches it) never stalls Whisper
+        self.text_queue = queue.Queue()
         
         # Monitor configuration
         self.monitor_config = monitor_config or {
@@ -72,28 +359,126 @@ class DualModeStreamer:
         logger.info(" DualModeStreamer initialized")
         logger.info(f" Server: {server_ip}:{server_port}")
         logger.info(f" Audio source: {self.audio_source}")
+        logger.info(f" Screen capture: {self.screen_capture}")
+        logger.info(f" Transcription window: {self.transcribe_window_seconds}s")
         logger.info(f" Monitor config: {self.monitor_config}")
         
-        # Initialize Faster-Whisper model
-        logger.info(" Loading Faster-Whisper model...")
-        self.whisper_model = WhisperModel("base.en", compute_type="int8")
-        logger.info(" Faster-Whisper model loaded")
+        # Faster-Whisper is loaded on first use by transcribe_and_send, so --check,
+        # --local-only and the app's recording start never wait for the model
+        self._whisper_model = None
+        self._batched_model = None
+        self._whisper_lock = threading.Lock()
+    
+    @property
+    def whisper_model(self):
+        if self._whisper_model is None:
+            self._load_whisper()
+        return self._whisper_model
+    
+    @property
+    def batched_model(self):
+        if self._batched_model is None:
+            self._load_whisper()
+        return self._batched_model
+    
+    def _load_whisper(self):
+        """Load and warm up Faster-Whisper once; concurrent callers wait for that load"""
+        with self._whisper_lock:
+            if self._batched_model is not None:
+                return
+            from faster_whisper import BatchedInferencePipeline, WhisperModel
+            
+            logger.info(f" Loading Faster-Whisper model {self.whisper_model_name}...")
+            whisper_options = get_whisper_device_options()
+            try:
+                self._whisper_model = WhisperModel(self.whisper_model_name, **whisper_options)
+            except RuntimeError as e:
+                if whisper_options["device"] != "cuda":
+                    raise
+                # A GPU without the CUDA/cuBLAS runtime DLLs shows up here
+                logger.warning(f" CUDA Whisper load failed, using CPU: {e}")
+                whisper_options = get_whisper_device_options(allow_cuda=False)
+                self._whisper_model = WhisperModel(self.whisper_model_name, **whisper_options)
+            logger.info(f" Faster-Whisper model loaded ({whisper_options['device']}, {whisper_options['compute_type']})")
+            self._warm_up_whisper()
+            self._batched_model = BatchedInferencePipeline(model=self._whisper_model)
+    
+    def _warm_up_whisper(self):
+        """Run one throwaway decode so kernel setup and buffer allocation don't land on the first real window"""
+        started = time.perf_counter()
+        try:
+            # VAD off: on silence it would skip the encoder this is meant to exercise
+            segments, _ = self._whisper_model.transcribe(
+                np.zeros(16000, dtype=np.float32), beam_size=1, language="en",
+                temperature=0.0, without_timestamps=True, vad_filter=False
+            )
+            list(segments)
+            # Second pass with VAD on only loads the Silero model (silence skips decoding)
+            segments, _ = self._whisper_model.transcribe(
+                np.zeros(16000, dtype=np.float32), language="en", vad_filter=True
+            )
+            list(segments)
+            logger.info(f" Faster-Whisper warm-up complete ({time.perf_counter() - started:.1f}s)")
+        except Exception as e:
+            logger.warning(f" Faster-Whisper warm-up failed: {e}")
         
+    @property
+    def transcription_active(self):
+        return self._transcription_active.is_set()
+    
+    @transcription_active.setter
+    def transcription_active(self, active):
+        if active:
+            # Discard audio left over from a previous session
+            self.audio_ring.reset()
+            self._transcription_active.set()
+        else:
+            self._transcription_active.clear()
+            # Wake a transcription loop blocked on the ring
+            self.audio_ring.close()
+    
+    @property
+    def recording_active(self):
+        return self._recording_active.is_set()
+    
+    @recording_active.setter
+    def recording_active(self, active):
+        if active:
+            self._recording_done.clear()
+            self._recording_active.set()
+        else:
+            self._recording_active.clear()
+            self._recording_done.set()
+    
+    def _watch_video_process(self, process):
+        """Wake record_video_local as soon as ffmpeg exits on its own"""
+        process.wait()
+        if self.video_process is process:
+            self._recording_done.set()
+    
     def check_setup(self):
         """Verify VoiceMeeter B1 is available"""
         logger.info(" Checking VoiceMeeter B1 setup...")
+        self.video_encoder = self._select_video_encoder()
         try:
             cmd = [get_ffmpeg_path(), "-list_devices", "true", "-f", "dshow", "-i", "dummy"]
             logger.debug(f" Running command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            output_text = result.stderr if result.stderr else result.stdout
+            # Scan the device list as it streams and stop ffmpeg at the first match
+            process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                       text=True, bufsize=1)
+            try:
+                for line in process.stderr:
+                    if self.audio_source in line:
+                        logger.info(" VoiceMeeter B1 ready")
+                        return True
+            finally:
+                if process.poll() is None:
+                    process.terminate()
+                process.stderr.close()
+                process.wait(timeout=5)
             
-            if self.audio_source in output_text:
-                logger.info(" VoiceMeeter B1 ready")
-                return True
-            else:
-                logger.error(f" VoiceMeeter B1 not found! Audio source '{self.audio_source}' not available")
-                return False
+            logger.error(f" VoiceMeeter B1 not found! Audio source '{self.audio_source}' not available")
+            return False
                 
         except FileNotFoundError:
             logger.error(" FFmpeg not found!")
@@ -107,31 +492,18 @@ class DualModeStreamer:
         logger.info(" Starting audio capture for transcription...")
         cmd = [
             get_ffmpeg_path(), "-y", "-loglevel", "quiet",
-            "-f", "dshow", "-i", f"audio={self.audio_source}",
-            "-ac", "1", "-ar", "16000", "-f", "s16le", "-"
+            *FAST_PROBE_ARGS, "-f", "dshow", "-i", f"audio={self.audio_source}",
+            *TRANSCRIBE_PCM_ARGS, "-"
         ]
         
         logger.debug(f" Audio capture command: {' '.join(cmd)}")
         
         try:
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+            # Unbuffered: readinto goes straight to the pipe, no BufferedReader copy
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=0)
+            self.audio_process = process
             logger.info(f" Audio capture process started with PID: {process.pid}")
-            chunk_size = 16000 * 3 * 2  # 3 seconds
-            
-            chunk_count = 0
-            while self.transcription_active:
-                chunk = process.stdout.read(chunk_size)
-                if chunk:
-                    chunk_count += 1
-                    if chunk_count % 10 == 0:  # Log every 30 seconds
-                        logger.debug(f" Audio chunks captured: {chunk_count}")
-                    audio_data = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
-                    self.audio_queue.put(audio_data)
-                else:
-                    logger.warning(" Audio capture: No data received")
-                    break
-                    
-            logger.info(f" Audio capture completed - {chunk_count} chunks processed")
+            self.read_transcription_audio(process.stdout)
             
         except Exception as e:
             logger.error(f" Audio capture error: {e}")
@@ -142,50 +514,252 @@ class DualModeStreamer:
             except:
                 pass
     
+    def read_transcription_audio(self, stream, drain=False):
+        """Read 16 kHz mono f32le audio from an ffmpeg pipe into the transcription ring
+        
+        With drain=True the pipe is read until EOF even after transcription stops, so a
+        combined recording process never blocks on a full stdout pipe. Reads go
+        straight into a reused buffer, so no bytes object is allocated per chunk.
+        """
+        # 1 s reads: a window is seen as complete at most a second after its audio arrives
+        chunk_samples = 16000
+        # The pipe must keep draining while Whisper saturates the other cores
+        raise_current_thread_priority()
+        # Reused scratch: the pipe is read straight into float32, no conversion pass
+        scratch = np.empty(chunk_samples, dtype=np.float32)
+        scratch_bytes = memoryview(scratch).cast('B')
+        sample_size = scratch.itemsize
+        
+        chunk_count = 0
+        while self.transcription_active or drain:
+            # Raw pipes may return short reads; fill the whole chunk so samples stay aligned
+            bytes_read = 0
+            while bytes_read < len(scratch_bytes):
+                n = stream.readinto(scratch_bytes[bytes_read:])
+                if not n:
+                    break
+                bytes_read += n
+            if bytes_read < sample_size:
+                if self.transcription_active:
+                    logger.warning(" Audio capture: No data received")
+                break
+            if not self.transcription_active:
+                continue
+            chunk_count += 1
+            if chunk_count % 30 == 0:  # Log every 30 seconds
+                logger.debug(" Audio chunks captured: %d", chunk_count)
+            dropped = self.audio_ring.write(scratch[:bytes_read // sample_size])
+            if dropped:
+                if not self.dropped_samples:
+                    logger.warning(" Transcription falling behind - dropping the oldest audio")
+                self.dropped_samples += dropped
+                
+        logger.info(f" Audio capture completed - {chunk_count} chunks processed")
+    
     def transcribe_and_send(self):
         logger.info(" Starting transcription processing...")
-        buffer = []
-        required_samples = 16000 * 3
+        try:
+            # First use loads the model, while the first window is still buffering
+            batched_model = self.batched_model
+        except Exception as e:
+            logger.error(f" Faster-Whisper load failed - transcription disabled: {e}")
+            self.transcription_active = False
+            return
+        # Whisper pads every input to a 30 s mel window, so 15 s windows cost the
+        # same encoder pass as 3 s ones. Consecutive windows share 1 s of audio; a
+        # segment belongs to the window whose owned range contains its midpoint.
+        window_samples = 16000 * self.transcribe_window_seconds
+        overlap_samples = 16000 * TRANSCRIBE_OVERLAP_SECONDS
+        half_overlap = TRANSCRIBE_OVERLAP_SECONDS / 2
+        has_prefix = False
         transcription_count = 0
+        sender = threading.Thread(target=self._send_loop, daemon=True)
+        sender.start()
         
-        while self.transcription_active:
+        stride_samples = window_samples - overlap_samples
+        # Reused for every call; a span never exceeds what the ring can hold
+        window_buffer = np.empty(self.audio_ring.capacity, dtype=np.float32)
+        
+        min_tail_samples = int(16000 * TRANSCRIBE_MIN_TAIL_SECONDS)
+        
+        while True:
+            final = False
             try:
-                data = self.audio_queue.get(timeout=0.1)
-                buffer.extend(data.flatten())
+                # Blocks until a full window is buffered; clearing transcription_active closes the ring
+                available = self.audio_ring.wait_for(window_samples)
+                if available is None:
+                    # Stopped: what is left in the ring is the end of the meeting, so it is
+                    # transcribed too. Only the first half of the carried-over second was
+                    # owned by the previous window; the rest has not been sent yet.
+                    final = True
+                    available = self.audio_ring.unread()
+                    if available - (overlap_samples // 2 if has_prefix else 0) < min_tail_samples:
+                        break
+                    window_count = 1 + max(available - window_samples, 0) // stride_samples
+                    span_samples = consume_samples = available
+                else:
+                    # Every complete window goes into one call (more than one only when
+                    # transcription fell behind); the batched pipeline splits it at VAD
+                    # boundaries and encodes the pieces together
+                    window_count = 1 + (available - window_samples) // stride_samples
+                    span_samples = window_samples + (window_count - 1) * stride_samples
+                    # The last second stays in the ring as the next window's prefix
+                    consume_samples = span_samples - overlap_samples
+                audio_chunk = self.audio_ring.read(span_samples, consume=consume_samples,
+                                                   out=window_buffer)
+                owned_start = half_overlap if has_prefix else 0.0
+                # The final span has no successor to hand its last half second to
+                owned_end = span_samples / 16000 - (0.0 if final else half_overlap)
+                has_prefix = True
                 
-                if len(buffer) >= required_samples:
-                    audio_chunk = np.array(buffer[:required_samples], dtype=np.float32)
-                    buffer = buffer[required_samples:]
-                    
-                    logger.debug(f" Processing audio chunk {transcription_count + 1} ({len(audio_chunk)} samples)")
-                    
-                    segments, _ = self.whisper_model.transcribe(audio_chunk, beam_size=1, language="en")
-                    for segment in segments:
-                        text = segment.text.strip()
-                        if text:
-                            transcription_count += 1
-                            timestamp = time.strftime('%H:%M:%S')
-                            logger.info(f" [{timestamp}] Transcription #{transcription_count}: {text}")
-
-                            self.send_text_to_server(text)
-                        else:
-                            logger.debug(" Empty transcription segment")
-                            
-            except queue.Empty:
-                continue
+                if np.abs(audio_chunk).max() < SILENCE_PEAK:
+                    logger.debug(" Skipping %d silent audio window(s)", window_count)
+                else:
+                    transcription_count = self._transcribe_span(
+                        batched_model, audio_chunk, owned_start, owned_end, window_count, transcription_count)
+                        
             except Exception as e:
                 logger.error(f" Transcription error: {e}")
+            if final:
+                break
                 
+        self.text_queue.put(None)
+        # No timeout: the caller uploads the transcript file once this returns, so
+        # every queued line must be written first; the queue is finite after stop
+        sender.join()
         logger.info(f" Transcription processing completed - {transcription_count} transcriptions processed")
     
+    def _transcribe_span(self, batched_model, audio_chunk, owned_start, owned_end, window_count,
+                         transcription_count):
+        """Transcribe one span and queue the segments it owns; returns the updated transcription count"""
+        logger.debug(" Processing %d audio window(s) (%d samples)", window_count, len(audio_chunk))
+        
+        segments, _ = batched_model.transcribe(audio_chunk, **TRANSCRIBE_OPTIONS)
+        decoded_tokens = 0
+        for segment in segments:
+            decoded_tokens += len(segment.tokens)
+            midpoint = (segment.start + segment.end) / 2
+            if not owned_start <= midpoint < owned_end:
+                continue
+            text = segment.text.strip()
+            if text:
+                transcription_count += 1
+                # Hot path: %-style arguments are only formatted if a handler emits the record
+                logger.info(" [%s] Transcription #%d: %s",
+                            time.strftime('%H:%M:%S'), transcription_count, text)
+
+                self.text_queue.put_nowait(text)
+            else:
+                logger.debug(" Empty transcription segment")
+        # Should stay roughly constant per window; growth means context is leaking
+        logger.debug(" Decoded %d tokens for %d window(s)", decoded_tokens, window_count)
+        return transcription_count
+    
+    def _send_loop(self):
+        """Deliver transcripts in order until transcribe_and_send queues None"""
+        while True:
+            text = self.text_queue.get()
+            if text is None:
+                break
+            try:
+                self.send_text_to_server(text)
+            except Exception as e:
+                logger.error(f" Transcript delivery error: {e}")
+    
     def send_text_to_server(self, text):
         # Server communication disabled - only local processing now
-        logger.debug(f" Processing transcript locally: {text[:50]}...")
+        logger.debug(" Processing transcript locally: %.50s...", text)
         # Note: The monkey patch in app.py will still capture this for local saving
         logger.debug(" Transcript processed locally")
     
-    def record_video_local(self, output_file):
-        """Record screen + audio to local file (main thread) - NO DURATION LIMIT"""
+    def _ddagrab_output_idx(self):
+        """DXGI output index for ddagrab: explicit 'output_idx', else the DISPLAYn device number - 1"""
+        if 'output_idx' in self.monitor_config:
+            return int(self.monitor_config['output_idx'])
+        device_name = self.monitor_config.get('device_name', '')
+        digits = ''.join(ch for ch in device_name if ch.isdigit())
+        return max(int(digits) - 1, 0) if digits else 0
+    
+    def _resolve_screen_capture(self):
+        """Fall back from ddagrab to gdigrab when the probed encoder cannot take D3D11 frames"""
+        if self.video_encoder is None:
+            self.video_encoder = self._select_video_encoder()
+        # Every hardware encoder takes ddagrab's D3D11 frames (QSV through hwmap); software ones cannot
+        if self.screen_capture == "ddagrab" and self.video_encoder not in HARDWARE_VIDEO_ENCODERS:
+            logger.warning(f" ddagrab needs a D3D11-capable hardware encoder, {self.video_encoder} "
+                           f"is not one - capturing with gdigrab")
+            self.screen_capture = "gdigrab"
+    
+    def _screen_input_args(self):
+        """FFmpeg input arguments for the selected monitor"""
+        self._resolve_screen_capture()
+        if self.screen_capture == "ddagrab":
+            # DXGI Desktop Duplication: frames stay in D3D11 textures on the GPU
+            return [
+                *FAST_PROBE_ARGS, "-f", "lavfi",
+                "-i", f"ddagrab=output_idx={self._ddagrab_output_idx()}:framerate=5",
+            ]
+        return [
+            "-thread_queue_size", "512", "-fflags", "nobuffer", *FAST_PROBE_ARGS,
+            # No cursor: gdigrab would composite it with an extra GDI blit per frame
+            "-f", "gdigrab", "-framerate", "5", "-draw_mouse", "0",
+            "-offset_x", str(self.monitor_config['x']), 
+            "-offset_y", str(self.monitor_config['y']),
+            "-video_size", f"{self.monitor_config['width']}x{self.monitor_config['height']}",
+            "-i", "desktop",
+        ]
+    
+    def _select_video_encoder(self):
+        """Pick a usable hardware encoder, else the fastest software encoder in this FFmpeg build"""
+        available = get_ffmpeg_encoders()
+        for encoder in HARDWARE_VIDEO_ENCODERS:
+            if encoder in available and ffmpeg_encoder_works(encoder):
+                logger.info(f" Hardware video encoder: {encoder}")
+                return encoder
+        
+        encoder = "libsvtav1" if "libsvtav1" in available else "libx265"
+        logger.info(f" Software video encoder: {encoder}")
+        return encoder
+    
+    def _video_encode_args(self):
+        """FFmpeg video filter/encoder arguments matching the capture method"""
+        self._resolve_screen_capture()
+        pix_fmt = "yuv420p"
+        if self.video_encoder == "hevc_nvenc":
+            # Encoder ASICs leave the CPU cores to Whisper; constant-quality HEVC
+            # keeps static screen content small
+            codec_args = ["-c:v", "hevc_nvenc", "-preset", "p5", "-tune", "hq", "-rc", "vbr", "-cq", "30", "-b:v", "0"]
+        elif self.video_encoder == "h264_nvenc":
+            # Pre-Maxwell-2 NVENC has no HEVC
+            codec_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "ll", "-b:v", "2M"]
+        elif self.video_encoder == "hevc_qsv":
+            codec_args = ["-c:v", "hevc_qsv", "-preset", "veryfast", "-global_quality", "28"]
+            pix_fmt = "nv12"
+        elif self.video_encoder == "h264_amf":
+            codec_args = ["-c:v", "h264_amf", "-usage", "lowlatency", "-quality", "speed", "-b:v", "2M"]
+        elif self.video_encoder == "libsvtav1":
+            # SVT-AV1's AVX2/AVX-512 kernels are several times faster than x265 here
+            codec_args = ["-c:v", "libsvtav1", "-preset", "10", "-crf", "40", "-svtav1-params", "tune=0"]
+        else:
+            # Short lookahead and no B-frames: 5 fps screen content gains nothing from them
+            codec_args = ["-c:v", "libx265", "-preset", "ultrafast", "-crf", "32",
+                          "-x265-params", "log-level=error:rc-lookahead=5:bframes=0"]
+        
+        if self.screen_capture == "ddagrab":
+            # The encoder consumes the D3D11 frames directly, no CPU round trip
+            hw_filter = ["-vf", "hwmap=derive_device=qsv,format=qsv"] if self.video_encoder == "hevc_qsv" else []
+            return [*hw_filter, *codec_args, "-g", "50", "-keyint_min", "50"]
+        # fast_bilinear is plenty for a 1920->1280 downscale at 5 fps; a keyframe every
+        # 10 s suits slowly changing slides and shared screens
+        return ["-vf", "scale=1280:-1:flags=fast_bilinear", *codec_args,
+                "-g", "50", "-keyint_min", "50", "-pix_fmt", pix_fmt]
+    
+    def record_video_local(self, output_file, transcribe=False):
+        """Record screen + audio to local file (main thread) - NO DURATION LIMIT
+        
+        With transcribe=True the same ffmpeg process also writes 16 kHz mono PCM to
+        stdout for Whisper, so the audio device is opened and captured only once.
+        """
         logger.info(" Starting local video recording...")
         logger.info(f" Output file: {output_file}")
         logger.info(f" Monitor configuration received: {self.monitor_config}")
@@ -195,33 +769,46 @@ class DualModeStreamer:
         logger.info(f" Monitor dimensions: {self.monitor_config['width']}x{self.monitor_config['height']}")
         logger.info(f" Monitor name: {self.monitor_config['name']}")
         
+        # Audio is captured and decoded once; with transcription it is split in the
+        # filter graph into the Opus file branch and a 16 kHz PCM branch
+        if transcribe:
+            audio_filter_args = [
+                "-filter_complex",
+                "[1:a]asplit=2[afile_in][apcm_in];"
+                "[afile_in]aresample=async=1[afile];"
+                "[apcm_in]aresample=16000,aformat=sample_fmts=flt:channel_layouts=mono[apcm]",
+            ]
+            audio_map = "[afile]"
+        else:
+            audio_filter_args = ["-filter:a", "aresample=async=1"]
+            audio_map = "1:a"
+        
         # Build ffmpeg command with dynamic monitor config
         cmd = [
             get_ffmpeg_path(), "-y", "-loglevel", "error",
-            "-thread_queue_size", "512", "-fflags", "nobuffer",
-            "-f", "gdigrab", "-framerate", "5",
-            "-offset_x", str(self.monitor_config['x']), 
-            "-offset_y", str(self.monitor_config['y']),
-            "-video_size", f"{self.monitor_config['width']}x{self.monitor_config['height']}",
-            "-i", "desktop",
-            "-thread_queue_size", "512",
+            *self._screen_input_args(),
+            "-thread_queue_size", "512", *FAST_PROBE_ARGS,
             "-f", "dshow", "-i", f"audio={self.audio_source}",
-            "-vf", "scale=1280:-1",
-            "-filter:a", "volume=1.0",
-            "-c:v", "libx265", "-preset", "fast", "-crf", "32", "-pix_fmt", "yuv420p",
+            *audio_filter_args,
+            "-map", "0:v", "-map", audio_map,
+            *self._video_encode_args(),
             "-c:a", "libopus", "-b:a", "64k", "-ac", "1", "-ar", "48000",
-            "-movflags", "+faststart",
-            "-async", "1", "-vsync", "1", "-avoid_negative_ts", "make_zero",
+            "-vsync", "1", "-avoid_negative_ts", "make_zero",
             output_file
         ]
+        if transcribe:
+            # Second output from the same capture: raw PCM for transcription
+            cmd += ["-map", "[apcm]", "-f", "f32le", "-flush_packets", "1", "pipe:1"]
         
         # Log the complete FFmpeg command for debugging
         ffmpeg_logger.info(" FFmpeg command parameters:")
-        ffmpeg_logger.info(f"    Video input: gdigrab desktop")
+        ffmpeg_logger.info(f"    Video input: {self.screen_capture} desktop")
         ffmpeg_logger.info(f"    Offset: X={self.monitor_config['x']}, Y={self.monitor_config['y']}")
         ffmpeg_logger.info(f"    Video size: {self.monitor_config['width']}x{self.monitor_config['height']}")
         ffmpeg_logger.info(f"    Audio input: {self.audio_source}")
         ffmpeg_logger.info(f"    Output: {output_file}")
+        if transcribe:
+            ffmpeg_logger.info("    Output: 16 kHz PCM to stdout for transcription")
         ffmpeg_logger.debug(f"    Full command: {' '.join(cmd)}")
         
         # Print key info to console for immediate visibility
@@ -230,18 +817,35 @@ class DualModeStreamer:
         self.recording_active = True
         try:
             logger.info(" Starting FFmpeg process...")
-            self.video_process = subprocess.Popen(cmd)
+            if transcribe:
+                self.video_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=0)
+                audio_thread = threading.Thread(
+                    target=self.read_transcription_audio,
+                    args=(self.video_process.stdout, True),
+                    daemon=True
+                )
+                audio_thread.start()
+                cpu_split = get_cpu_split()
+                if cpu_split:
+                    # Only the ffmpeg child is pinned; this process also hosts the app and
+                    # the uploader, so Whisper is held to the other half by its cpu_threads
+                    ffmpeg_cpus, whisper_cpus = cpu_split
+                    if set_process_affinity(self.video_process.pid, ffmpeg_cpus):
+                        logger.info(f" CPU affinity: ffmpeg on {len(ffmpeg_cpus)} CPUs, "
+                                    f"Whisper sized for the other {len(whisper_cpus)}")
+            else:
+                self.video_process = subprocess.Popen(cmd)
             ffmpeg_logger.info(f" FFmpeg process started with PID: {self.video_process.pid}")
+            threading.Thread(target=self._watch_video_process, args=(self.video_process,), daemon=True).start()
 
-            # Poll until process exits or recording_active cleared - NO TIME LIMIT
-            while True:
-                if not self.recording_active:
-                    logger.info(" Recording stop requested")
-                    break
-                if self.video_process.poll() is not None:
-                    logger.info(" FFmpeg process ended")
-                    break
-                time.sleep(0.5)
+            # Wait until ffmpeg exits or recording_active is cleared - NO TIME LIMIT.
+            # The timeout only keeps Ctrl+C responsive; either event wakes this at once.
+            while not self._recording_done.wait(timeout=1.0):
+                pass
+            if self.recording_active:
+                logger.info(" FFmpeg process ended")
+            else:
+                logger.info(" Recording stop requested")
 
             if self.video_process and self.video_process.poll() is None:
                 logger.info(" Terminating FFmpeg process...")
@@ -311,14 +915,6 @@ class DualModeStreamer:
         
 
         
-        # Start FFmpeg audio capture in background thread
-        logger.info(" Starting audio capture thread...")
-        audio_thread = threading.Thread(
-            target=self.capture_audio_for_transcription,
-            daemon=True
-        )
-        audio_thread.start()
-        
         # Start transcription processing in background thread
         self.transcription_active = True
         logger.info(" Starting transcription thread...")
@@ -328,18 +924,19 @@ class DualModeStreamer:
         )
         transcription_thread.start()
         
-        # Start video recording in main thread (so Ctrl+C works properly)
+        # Start video recording in main thread (so Ctrl+C works properly);
+        # the same ffmpeg process feeds transcription audio
         logger.info(" Starting video recording...")
-        success = self.record_video_local(output_file)
+        success = self.record_video_local(output_file, transcribe=True)
         
         # Signal transcription to stop
         logger.info(" Stopping transcription...")
         self.transcription_active = False
         
-        # Wait for threads to complete
+        # Wait for threads to complete. No timeout: the ring is closed, so only the
+        # audio already buffered is left, and the transcript must be complete before upload
         logger.info(" Waiting for threads to complete...")
-        audio_thread.join(timeout=5)
-        transcription_thread.join(timeout=5)
+        transcription_thread.join()
         
         if success:
             logger.info(" SESSION COMPLETED SUCCESSFULLY")
@@ -441,6 +1038,8 @@ class DualModeStreamer:
 
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Dual-Mode Streaming: Real-time Audio + Local Video Recording",
         epilog="""
@@ -460,10 +1059,18 @@ Examples:
     parser.add_argument('--transcribe-only', action='store_true', help='Transcription only (no video recording)')
     parser.add_argument('--local-only', action='store_true', help='Local recording only (no transcription)')
     parser.add_argument('--check', action='store_true', help='Check VoiceMeeter setup')
+    parser.add_argument('--model', default=None,
+                        help='Faster-Whisper model (default: $WHISPER_MODEL or the saved setting, base.en). '
+                             'tiny.en is several times faster on weak CPUs at lower accuracy; '
+                             'distil-small.en is more accurate but slower than base.en')
+    parser.add_argument('--window', type=int, default=None, metavar='SECONDS',
+                        help='Live transcription window, 2-29 s (default: the saved setting, 15). '
+                             'Shorter windows show text sooner but call Whisper more often')
     
     args = parser.parse_args()
     
-    streamer = DualModeStreamer(server_ip=args.server, server_port=args.port)
+    streamer = DualModeStreamer(server_ip=args.server, server_port=args.port, whisper_model=args.model,
+                                transcribe_window=args.window)
     
     if args.check:
         streamer.check_setup()
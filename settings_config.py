@@ -23,6 +23,10 @@ class SettingsManager:
                 "default_monitor_id": 0,
                 "auto_delete_days": 30,
                 "audio_source": "Voicemeeter Out B1 (VB-Audio Voicemeeter VAIO)",
+                "screen_capture": "gdigrab",
+                "whisper_model": "base.en",
+                "whisper_cpu_threads": 0,
+                "transcribe_window_seconds": 15,
                 "last_updated": None
             }
         }
@@ -647,5 +651,69 @@ class SettingsManager:
         settings["user_preferences"]["audio_source"] = audio_source
         return self.save_settings(settings)
 
+    def get_screen_capture(self):
+        """Get screen capture method: 'gdigrab' (CPU, default) or 'ddagrab' (DXGI + NVENC)"""
+        settings = self.load_settings()
+        return settings["user_preferences"].get("screen_capture", "gdigrab")
+    
+    def set_screen_capture(self, method):
+        """Set screen capture method"""
+        if method not in ("gdigrab", "ddagrab"):
+            logger.error(f" Invalid screen capture method: {method}")
+            return False
+        settings = self.load_settings()
+        settings["user_preferences"]["screen_capture"] = method
+        return self.save_settings(settings)
+    
+    def get_whisper_model(self):
+        """Get the Faster-Whisper model name or path (smaller models such as 'tiny.en' suit slow CPUs)"""
+        settings = self.load_settings()
+        return settings["user_preferences"].get("whisper_model", "base.en")
+    
+    def set_whisper_model(self, model_name):
+        """Set the Faster-Whisper model name or path"""
+        if not model_name or not str(model_name).strip():
+            logger.error(" Invalid Whisper model name")
+            return False
+        settings = self.load_settings()
+        settings["user_preferences"]["whisper_model"] = str(model_name).strip()
+        return self.save_settings(settings)
+    
+    def get_whisper_cpu_threads(self):
+        """Get the CPU thread count for Faster-Whisper (0 = one per core left to it while recording)"""
+        settings = self.load_settings()
+        return settings["user_preferences"].get("whisper_cpu_threads", 0)
+    
+    def set_whisper_cpu_threads(self, threads):
+        """Set the CPU thread count for Faster-Whisper"""
+        try:
+            threads = int(threads)
+        except (TypeError, ValueError):
+            threads = -1
+        if threads < 0:
+            logger.error(f" Invalid Whisper CPU thread count: {threads}")
+            return False
+        settings = self.load_settings()
+        settings["user_preferences"]["whisper_cpu_threads"] = threads
+        return self.save_settings(settings)
+    
+    def get_transcribe_window(self):
+        """Get the live transcription window in seconds (shorter = lower latency, more Whisper calls)"""
+        settings = self.load_settings()
+        return settings["user_preferences"].get("transcribe_window_seconds", 15)
+    
+    def set_transcribe_window(self, seconds):
+        """Set the live transcription window in seconds (2-29: it must fit Whisper's 30 s context)"""
+        try:
+            seconds = int(seconds)
+        except (TypeError, ValueError):
+            seconds = 0
+        if not 2 <= seconds <= 29:
+            logger.error(f" Invalid transcription window: {seconds}")
+            return False
+        settings = self.load_settings()
+        settings["user_preferences"]["transcribe_window_seconds"] = seconds
+        return self.save_settings(settings)
+
 # Global instance
 settings_manager = SettingsManager()
\ No newline at end of file
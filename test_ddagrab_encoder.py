@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test that ddagrab capture follows the probed video encoder
+
+ddagrab hands out D3D11 frames, so the encoder must be a hardware one; with a
+software encoder the recorder has to fall back to gdigrab instead of failing.
+"""
+
+from dual_stream import DualModeStreamer
+
+def ffmpeg_video_args(encoder):
+    """(input args, encode args) for ddagrab capture with `encoder` already probed"""
+    streamer = DualModeStreamer()
+    streamer.screen_capture = "ddagrab"
+    streamer.video_encoder = encoder
+    return streamer._screen_input_args(), streamer._video_encode_args()
+
+def test_hardware_encoder_keeps_ddagrab():
+    """The probed hardware encoder is used rather than a hardcoded NVENC"""
+    for encoder in ("hevc_nvenc", "h264_nvenc", "h264_amf"):
+        input_args, encode_args = ffmpeg_video_args(encoder)
+        assert any(arg.startswith("ddagrab=") for arg in input_args), input_args
+        assert encode_args[encode_args.index("-c:v") + 1] == encoder, encode_args
+        assert "-vf" not in encode_args, encode_args
+
+def test_qsv_maps_d3d11_frames():
+    """QSV reads the D3D11 frames through a derived device"""
+    input_args, encode_args = ffmpeg_video_args("hevc_qsv")
+    assert any(arg.startswith("ddagrab=") for arg in input_args), input_args
+    assert encode_args[:2] == ["-vf", "hwmap=derive_device=qsv,format=qsv"], encode_args
+    assert encode_args[encode_args.index("-c:v") + 1] == "hevc_qsv", encode_args
+
+def test_software_encoder_falls_back_to_gdigrab():
+    """No D3D11-capable encoder: capture with gdigrab and encode on the CPU"""
+    for encoder in ("libsvtav1", "libx265"):
+        input_args, encode_args = ffmpeg_video_args(encoder)
+        assert "gdigrab" in input_args, input_args
+        assert encode_args[encode_args.index("-c:v") + 1] == encoder, encode_args
+
+if __name__ == "__main__":
+    for test in (test_hardware_encoder_keeps_ddagrab, test_qsv_maps_d3d11_frames,
+                 test_software_encoder_falls_back_to_gdigrab):
+        test()
+        print(f" {test.__name__}: passed")
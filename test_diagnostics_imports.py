@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Test that the diagnostics modules import through the package as well as as scripts
+
+Both share diagnostics/hidden_process.py; the import has to resolve whether
+diagnostics/ is on sys.path (script run) or not (package import from the repo root).
+"""
+
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+DIAGNOSTICS_DIR = Path(__file__).parent / "diagnostics"
+MODULES = ("system_diagnostics", "verify_monitor_positions")
+
+def test_modules_import_through_package():
+    """`import diagnostics.<module>` from the repo root"""
+    for name in MODULES:
+        module = importlib.import_module(f"diagnostics.{name}")
+        assert callable(module.run_hidden), name
+
+def test_modules_import_as_scripts():
+    """The same modules with diagnostics/ as the working directory, as when run directly"""
+    for name in MODULES:
+        result = subprocess.run([sys.executable, "-c", f"import {name}"], cwd=DIAGNOSTICS_DIR,
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+if __name__ == "__main__":
+    for test in (test_modules_import_through_package, test_modules_import_as_scripts):
+        test()
+        print(f" {test.__name__}: passed")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test that stopping transcription still transcribes the audio left in the ring
+
+Feeds whole transcription windows plus a partial one through transcribe_and_send
+with a stand-in model that "hears" one word per second, then checks every word -
+including the closing ones that never filled a window - comes out exactly once.
+"""
+
+import threading
+import time
+import numpy as np
+from dual_stream import DualModeStreamer
+
+SAMPLE_RATE = 16000
+
+class Segment:
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.tokens = [0]
+
+class OneWordPerSecondModel:
+    """Stand-in for BatchedInferencePipeline: second n of the input is the word encoded in its samples"""
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append(len(audio) / SAMPLE_RATE)
+        segments = []
+        for second in range(int(np.ceil(len(audio) / SAMPLE_RATE))):
+            samples = audio[second * SAMPLE_RATE:(second + 1) * SAMPLE_RATE]
+            word = int(round(samples[0] * 1000)) - 1
+            end = second + len(samples) / SAMPLE_RATE
+            segments.append(Segment(second, end, f"w{word}"))
+        return iter(segments), None
+
+def speech(seconds):
+    """Audio whose second n carries the marker for word n"""
+    audio = np.empty(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    for second in range(int(np.ceil(seconds))):
+        audio[second * SAMPLE_RATE:(second + 1) * SAMPLE_RATE] = (second + 1) / 1000
+    return audio
+
+def run_transcription(seconds, window_seconds=15, send=None):
+    """Transcribe `seconds` of audio, stopping once only a partial window is left; returns (texts, model)"""
+    streamer = DualModeStreamer(transcribe_window=window_seconds)
+    model = OneWordPerSecondModel()
+    streamer._whisper_model = model
+    streamer._batched_model = model
+    sent = []
+    streamer.send_text_to_server = send or sent.append
+
+    streamer.transcription_active = True
+    streamer.audio_ring.write(speech(seconds))
+    worker = threading.Thread(target=streamer.transcribe_and_send)
+    worker.start()
+
+    # Let every complete window go through before stopping mid-window
+    deadline = time.time() + 10
+    while streamer.audio_ring.unread() >= window_seconds * SAMPLE_RATE and time.time() < deadline:
+        time.sleep(0.01)
+    streamer.transcription_active = False
+    worker.join(timeout=20)
+    assert not worker.is_alive(), "transcribe_and_send did not finish after stop"
+    return sent, model
+
+def test_tail_is_transcribed_after_stop():
+    """2 full 15 s windows (14 s stride) + a partial one: all 40 words, in order, once each"""
+    sent, model = run_transcription(40)
+    assert sent == [f"w{n}" for n in range(40)], sent
+    # The two full windows (one batched 29 s call), then the 12 s left at stop:
+    # the 1 s overlap plus the 11 s that never filled a window
+    assert model.calls == [29.0, 12.0], model.calls
+
+def test_overlap_tail_is_sent_once():
+    """A stop right after a window leaves only its 1 s overlap; its word belongs to no window yet"""
+    sent, model = run_transcription(15)
+    assert sent == [f"w{n}" for n in range(15)], sent
+    assert model.calls == [15.0, 1.0], model.calls
+
+def test_short_session_is_transcribed():
+    """Stopping before the first window fills still transcribes what was said"""
+    sent, model = run_transcription(4)
+    assert sent == [f"w{n}" for n in range(4)], sent
+    assert model.calls == [4.0], model.calls
+
+def test_slow_delivery_finishes_before_return():
+    """The transcript file is uploaded once transcription returns, so a slow writer must not be cut off"""
+    sent = []
+    def slow_send(text):
+        time.sleep(5.5)  # longer than the old 5 s sender join
+        sent.append(text)
+    run_transcription(1, send=slow_send)
+    assert sent == ["w0"], sent
+
+if __name__ == "__main__":
+    for test in (test_tail_is_transcribed_after_stop, test_overlap_tail_is_sent_once,
+                 test_short_session_is_transcribed, test_slow_delivery_finishes_before_return):
+        test()
+        print(f" {test.__name__}: passed")
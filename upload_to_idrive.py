@@ -6,7 +6,6 @@ import os
 import sqlite3
 import boto3
 from pathlib import Path
-import glob
 import subprocess
 import json
 
@@ -48,35 +47,32 @@ def get_latest_recording():
         }
     return None
 
+def find_latest_file(directory, suffixes):
+    """Newest file in directory whose name ends with one of suffixes, by mtime, in one directory pass"""
+    latest_file = None
+    latest_mtime = -1
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(suffixes) and entry.is_file():
+                    mtime = entry.stat().st_mtime
+                    if mtime > latest_mtime:
+                        latest_mtime, latest_file = mtime, entry.path
+    except FileNotFoundError:
+        pass
+    return latest_file
+
 def find_recording_files(recording):
     """Find video, transcript and thumbnail files for the recording"""
     recordings_dir = "recordings"
     
     # Look for video file in recordings folder
-    video_patterns = [
-        os.path.join(recordings_dir, "*.mkv"),
-        os.path.join(recordings_dir, "*.mp4")
-    ]
-    
-    video_file = None
-    for pattern in video_patterns:
-        matches = glob.glob(pattern)
-        if matches:
-            video_file = matches[-1]  # Get most recent
-            break
-    
-    # Look for transcript file 
-    transcript_patterns = [
-        os.path.join(recordings_dir, "*_transcript.txt"),
-        os.path.join(recordings_dir, f"{recording['title']}_transcript.txt")
-    ]
+    video_file = find_latest_file(recordings_dir, (".mkv", ".mp4"))
     
-    transcript_file = None
-    for pattern in transcript_patterns:
-        matches = glob.glob(pattern)
-        if matches:
-            transcript_file = matches[-1]  # Get most recent
-            break
+    # Look for transcript file - this recording's own, else the most recent one
+    transcript_file = os.path.join(recordings_dir, f"{recording['title']}_transcript.txt")
+    if not os.path.isfile(transcript_file):
+        transcript_file = find_latest_file(recordings_dir, ("_transcript.txt",))
     
     # Look for thumbnail file
     thumbnail_file = None